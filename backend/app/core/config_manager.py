@@ -22,6 +22,22 @@ class TranslationConfig:
     temperature: float = 0.3
     timeout: int = 30
     enabled: bool = True
+    packed: bool = True  # 批量翻译时将多条文本打包到一个请求中
+    connection_limit: int = 32  # HTTP连接池最大连接数
+    keepalive_timeout: int = 30  # 空闲连接保持时间（秒）
+    dns_cache_ttl: int = 300  # DNS缓存时间（秒）
+    max_concurrency: int = 8  # 同时发往该提供商的最大请求数（自适应调整的上限）
+    requests_per_minute: int = 0  # 每分钟请求数上限，0表示不限制
+    tokens_per_minute: int = 0  # 每分钟token数上限（估算值），0表示不限制
+    max_retries: int = 3  # 被限流后的最大重试次数（超时最多重试一次）
+    hedge_percentile: float = 95  # 请求超过该耗时分位数仍未返回时发出对冲请求，0表示关闭
+    hedge_min_samples: int = 20  # 耗时样本数达到该值后才启用对冲
+    hedge_provider: str = ""  # 对冲请求发往的提供商：空为同一提供商，auto为其他已启用的提供商
+    breaker_window_seconds: int = 60  # 熔断器统计错误率的滑动窗口（秒）
+    breaker_min_requests: int = 10  # 窗口内请求数达到该值后才会熔断
+    breaker_failure_rate: float = 0.5  # 失败（含慢请求）比例达到该值时熔断
+    breaker_slow_call_seconds: float = 10.0  # 耗时超过该值的请求按失败计算
+    breaker_open_seconds: int = 30  # 熔断持续时间，之后放行探测请求
 
 @dataclass
 class OCRConfig:
@@ -33,6 +49,18 @@ class OCRConfig:
     det_db_unclip_ratio: float = 1.5
     rec_batch_num: int = 6
     lang: str = "ch"
+    worker_count: int = 2  # OCR工作进程数，0表示使用CPU核心数
+    max_queue_size: int = 16  # 等待中的OCR任务上限
+    tile_enabled: bool = True  # 超大图片自动分块识别
+    tile_size: int = 1280
+    tile_overlap: int = 160  # 应大于单行文字高度
+    tile_pixel_threshold: int = 16000000
+    two_pass_enabled: bool = True  # 缩小图检测、原图裁剪识别
+    two_pass_pixel_threshold: int = 2000000
+    two_pass_det_side: int = 1280  # 检测图长边
+    two_pass_min_text_height: int = 10  # 检测图中文字的最小高度
+    model_memory_budget_mb: int = 2048  # 每个工作进程内多语言模型的内存预算
+    max_loaded_models: int = 3
 
 @dataclass
 class ImageProcessingConfig:
@@ -44,6 +72,25 @@ class ImageProcessingConfig:
     default_font_color: tuple = (0, 0, 0)
     padding_ratio: float = 0.1
     line_spacing: float = 1.2
+    max_frames: int = 300  # 多帧图片（GIF/WebP/TIFF）处理的帧数上限
+
+@dataclass
+class CacheConfig:
+    """缓存配置"""
+    ocr_cache_enabled: bool = True
+    ocr_memory_entries: int = 256  # 进程内LRU缓存条目数
+    ocr_disk_max_mb: int = 512  # 磁盘缓存容量上限
+    ocr_cache_dir: str = "cache/ocr"
+    near_dup_enabled: bool = True  # 近似重复图片只重新识别差异区域
+    near_dup_entries: int = 64  # 保留的参考图片数
+    near_dup_max_mb: int = 256  # 参考图片灰度数组的内存上限
+    near_dup_max_distance: int = 6  # pHash/dHash最大汉明距离（64位）
+    near_dup_max_diff_ratio: float = 0.25  # 差异面积占比上限
+    translation_cache_enabled: bool = True  # 翻译记忆
+    translation_memory_entries: int = 2048  # 进程内LRU条目数
+    translation_max_entries: int = 100000  # SQLite持久层条目上限
+    translation_ttl_hours: int = 720
+    translation_db_path: str = "cache/translation_memory.db"
 
 @dataclass
 class UserPreferences:
@@ -84,7 +131,9 @@ class ConfigManager:
                 max_tokens=4000,
                 temperature=0.3,
                 timeout=30,
-                enabled=True
+                enabled=True,
+                requests_per_minute=500,
+                tokens_per_minute=200000
             ),
             "baidu": TranslationConfig(
                 provider="baidu",
@@ -94,7 +143,8 @@ class ConfigManager:
                 max_tokens=2000,
                 temperature=0.0,
                 timeout=30,
-                enabled=True
+                enabled=True,
+                requests_per_minute=600
             ),
             "google": TranslationConfig(
                 provider="google",
@@ -110,6 +160,7 @@ class ConfigManager:
         
         self.ocr_config = OCRConfig()
         self.image_processing_config = ImageProcessingConfig()
+        self.cache_config = CacheConfig()
         self.user_preferences = UserPreferences()
     
     def load_config(self):
@@ -133,6 +184,10 @@ class ConfigManager:
                 if "image_processing_config" in config_data:
                     self.image_processing_config = ImageProcessingConfig(**config_data["image_processing_config"])
                 
+                # 加载缓存配置
+                if "cache_config" in config_data:
+                    self.cache_config = CacheConfig(**config_data["cache_config"])
+                
                 # 加载用户偏好
                 if "user_preferences" in config_data:
                     self.user_preferences = UserPreferences(**config_data["user_preferences"])
@@ -156,6 +211,7 @@ class ConfigManager:
                 },
                 "ocr_config": asdict(self.ocr_config),
                 "image_processing_config": asdict(self.image_processing_config),
+                "cache_config": asdict(self.cache_config),
                 "user_preferences": asdict(self.user_preferences),
                 "last_updated": datetime.now().isoformat()
             }
@@ -217,6 +273,21 @@ class ConfigManager:
             logger.error(f"更新图像处理配置失败: {e}")
             return False
     
+    def get_cache_config(self) -> CacheConfig:
+        """获取缓存配置"""
+        return self.cache_config
+    
+    def update_cache_config(self, config: Dict[str, Any]) -> bool:
+        """更新缓存配置"""
+        try:
+            current_config = asdict(self.cache_config)
+            current_config.update(config)
+            self.cache_config = CacheConfig(**current_config)
+            return self.save_config()
+        except Exception as e:
+            logger.error(f"更新缓存配置失败: {e}")
+            return False
+    
     def get_user_preferences(self) -> UserPreferences:
         """获取用户偏好"""
         return self.user_preferences
@@ -261,6 +332,12 @@ class ConfigManager:
         if self.ocr_config.det_db_thresh < 0 or self.ocr_config.det_db_thresh > 1:
             validation_result["warnings"].append("OCR检测阈值应在0-1之间")
         
+        if self.ocr_config.worker_count < 0 or self.ocr_config.max_queue_size < 0:
+            validation_result["warnings"].append("OCR工作进程数和队列上限不能为负数")
+        
+        if self.ocr_config.tile_overlap >= self.ocr_config.tile_size:
+            validation_result["warnings"].append("OCR分块重叠应小于分块大小")
+        
         # 检查图像处理配置
         if self.image_processing_config.font_size_ratio <= 0:
             validation_result["warnings"].append("字体大小比例应大于0")
@@ -277,6 +354,7 @@ class ConfigManager:
                 },
                 "ocr_config": asdict(self.ocr_config),
                 "image_processing_config": asdict(self.image_processing_config),
+                "cache_config": asdict(self.cache_config),
                 "user_preferences": asdict(self.user_preferences),
                 "export_time": datetime.now().isoformat()
             }
@@ -304,6 +382,9 @@ class ConfigManager:
             if "image_processing_config" in config_data:
                 self.image_processing_config = ImageProcessingConfig(**config_data["image_processing_config"])
             
+            if "cache_config" in config_data:
+                self.cache_config = CacheConfig(**config_data["cache_config"])
+            
             if "user_preferences" in config_data:
                 self.user_preferences = UserPreferences(**config_data["user_preferences"])
             
@@ -21,6 +21,8 @@ class UploadedFile(Base):
     height = Column(Integer)
     format = Column(String(10))
     mode = Column(String(10))
+    phash = Column(String(16), index=True)  # 感知哈希（十六进制），用于近似重复检测
+    dhash = Column(String(16))  # 差异哈希（十六进制）
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
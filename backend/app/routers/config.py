@@ -6,6 +6,11 @@ from fastapi.responses import FileResponse
 from typing import Dict, Any
 from pydantic import BaseModel
 from ..core.config_manager import config_manager
+from ..services.ocr_cache import ocr_result_cache, ocr_config_fingerprint
+from ..services.ocr_worker_pool import ocr_worker_pool
+from ..services.ocr_similarity import near_duplicate_index
+from ..services.translation_memory import translation_memory
+from ..services.translation_service import translation_service
 import tempfile
 import os
 
@@ -34,6 +39,22 @@ async def get_translation_providers():
                 "temperature": config.temperature,
                 "timeout": config.timeout,
                 "enabled": config.enabled,
+                "packed": config.packed,
+                "connection_limit": config.connection_limit,
+                "keepalive_timeout": config.keepalive_timeout,
+                "dns_cache_ttl": config.dns_cache_ttl,
+                "max_concurrency": config.max_concurrency,
+                "requests_per_minute": config.requests_per_minute,
+                "tokens_per_minute": config.tokens_per_minute,
+                "max_retries": config.max_retries,
+                "hedge_percentile": config.hedge_percentile,
+                "hedge_min_samples": config.hedge_min_samples,
+                "hedge_provider": config.hedge_provider,
+                "breaker_window_seconds": config.breaker_window_seconds,
+                "breaker_min_requests": config.breaker_min_requests,
+                "breaker_failure_rate": config.breaker_failure_rate,
+                "breaker_slow_call_seconds": config.breaker_slow_call_seconds,
+                "breaker_open_seconds": config.breaker_open_seconds,
                 "has_api_key": bool(config.api_key)
             }
             providers[provider] = provider_config
@@ -82,7 +103,19 @@ async def get_ocr_config():
                 "det_db_box_thresh": ocr_config.det_db_box_thresh,
                 "det_db_unclip_ratio": ocr_config.det_db_unclip_ratio,
                 "rec_batch_num": ocr_config.rec_batch_num,
-                "lang": ocr_config.lang
+                "lang": ocr_config.lang,
+                "worker_count": ocr_config.worker_count,
+                "max_queue_size": ocr_config.max_queue_size,
+                "tile_enabled": ocr_config.tile_enabled,
+                "tile_size": ocr_config.tile_size,
+                "tile_overlap": ocr_config.tile_overlap,
+                "tile_pixel_threshold": ocr_config.tile_pixel_threshold,
+                "two_pass_enabled": ocr_config.two_pass_enabled,
+                "two_pass_pixel_threshold": ocr_config.two_pass_pixel_threshold,
+                "two_pass_det_side": ocr_config.two_pass_det_side,
+                "two_pass_min_text_height": ocr_config.two_pass_min_text_height,
+                "model_memory_budget_mb": ocr_config.model_memory_budget_mb,
+                "max_loaded_models": ocr_config.max_loaded_models
             }
         }
     except Exception as e:
@@ -96,9 +129,16 @@ async def update_ocr_config(request: ConfigUpdateRequest):
         if not success:
             raise HTTPException(status_code=500, detail="更新OCR配置失败")
         
+        # 配置变化后旧指纹下的缓存结果不再有效
+        ocr_result_cache.invalidate(keep_fingerprint=ocr_config_fingerprint(config_manager.get_ocr_config()))
+        near_duplicate_index.clear()
+        
+        # 后台按新配置重建OCR工作进程，预热完成后再切换
+        ocr_worker_pool.schedule_reload()
+        
         return {
             "success": True,
-            "message": "OCR配置更新成功"
+            "message": "OCR配置更新成功，OCR引擎正在后台重新加载"
         }
     except HTTPException:
         raise
@@ -119,7 +159,8 @@ async def get_image_processing_config():
                 "auto_font_color": img_config.auto_font_color,
                 "default_font_color": img_config.default_font_color,
                 "padding_ratio": img_config.padding_ratio,
-                "line_spacing": img_config.line_spacing
+                "line_spacing": img_config.line_spacing,
+                "max_frames": img_config.max_frames
             }
         }
     except Exception as e:
@@ -142,6 +183,60 @@ async def update_image_processing_config(request: ConfigUpdateRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"更新图像处理配置失败: {str(e)}")
 
+@router.get("/config/cache")
+async def get_cache_config():
+    """获取缓存配置"""
+    try:
+        cache_config = config_manager.get_cache_config()
+        return {
+            "success": True,
+            "data": {
+                "ocr_cache_enabled": cache_config.ocr_cache_enabled,
+                "ocr_memory_entries": cache_config.ocr_memory_entries,
+                "ocr_disk_max_mb": cache_config.ocr_disk_max_mb,
+                "ocr_cache_dir": cache_config.ocr_cache_dir,
+                "ocr_cache_stats": ocr_worker_pool.cache_stats(),
+                "near_dup_enabled": cache_config.near_dup_enabled,
+                "near_dup_entries": cache_config.near_dup_entries,
+                "near_dup_max_mb": cache_config.near_dup_max_mb,
+                "near_dup_max_distance": cache_config.near_dup_max_distance,
+                "near_dup_max_diff_ratio": cache_config.near_dup_max_diff_ratio,
+                "near_dup_stats": near_duplicate_index.stats(),
+                "translation_cache_enabled": cache_config.translation_cache_enabled,
+                "translation_memory_entries": cache_config.translation_memory_entries,
+                "translation_max_entries": cache_config.translation_max_entries,
+                "translation_ttl_hours": cache_config.translation_ttl_hours,
+                "translation_db_path": cache_config.translation_db_path,
+                "translation_cache_stats": translation_memory.stats()
+            }
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取缓存配置失败: {str(e)}")
+
+@router.put("/config/cache")
+async def update_cache_config(request: ConfigUpdateRequest):
+    """更新缓存配置"""
+    try:
+        success = config_manager.update_cache_config(request.config)
+        if not success:
+            raise HTTPException(status_code=500, detail="更新缓存配置失败")
+        
+        ocr_result_cache.apply_config(config_manager.get_cache_config())
+        near_duplicate_index.apply_config(config_manager.get_cache_config())
+        translation_memory.apply_config(config_manager.get_cache_config())
+        
+        # OCR结果缓存位于各工作进程中，按新缓存配置在后台重建工作进程
+        ocr_worker_pool.schedule_reload()
+        
+        return {
+            "success": True,
+            "message": "缓存配置更新成功，OCR工作进程正在后台重新加载"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"更新缓存配置失败: {str(e)}")
+
 @router.get("/config/user-preferences")
 async def get_user_preferences():
     """获取用户偏好设置"""
@@ -260,7 +355,8 @@ async def get_config_status():
                 "enabled_providers": enabled_providers,
                 "errors": validation_result["errors"],
                 "warnings": validation_result["warnings"],
-                "config_file_exists": os.path.exists(config_manager.config_file)
+                "config_file_exists": os.path.exists(config_manager.config_file),
+                "provider_health": translation_service.breaker_stats()
             }
         }
     except Exception as e:
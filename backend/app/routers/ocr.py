@@ -1,21 +1,35 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Dict, Any
+from pydantic import BaseModel
+import cv2
+import asyncio
 import os
 import logging
 
-from ..services.ocr_service import ocr_service
+from ..services.ocr_service import OCRService
+from ..services.ocr_worker_pool import ocr_worker_pool, OCRQueueFullError
+from ..services.ocr_model_registry import UnsupportedLanguageError
+from ..services.ocr_cache import ocr_result_cache
+from ..utils.file_utils import decode_image_bytes
+from ..utils.sse import format_sse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+class RecognizeRegionsRequest(BaseModel):
+    image_path: str
+    regions: List[List[List[float]]]  # 每个区域为多边形顶点列表
+    language: str = "auto"
+
 @router.post("/ocr/detect")
-async def detect_text(file: UploadFile = File(...)):
+async def detect_text(file: UploadFile = File(...), language: str = "auto"):
     """
     检测图片中的文字
     
     Args:
         file: 上传的图片文件
+        language: 源语言（如zh、ja、ko），auto表示根据识别结果自动选择模型
         
     Returns:
         文字检测结果
@@ -24,18 +38,15 @@ async def detect_text(file: UploadFile = File(...)):
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="只支持图片文件")
         
-        # 保存上传的文件
-        file_path = f"uploads/{file.filename}"
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # 直接在内存中解码上传的图片
+        content = await file.read()
+        try:
+            image = await asyncio.to_thread(decode_image_bytes, content)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"无效的图像文件: {str(e)}")
         
         # 进行文字检测
-        text_results = ocr_service.detect_text(file_path)
-        
-        # 清理临时文件
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        text_results = await ocr_worker_pool.detect_text_from_array(image, language)
         
         return JSONResponse(content={
             "success": True,
@@ -43,17 +54,123 @@ async def detect_text(file: UploadFile = File(...)):
             "message": f"检测到 {len(text_results)} 个文字区域"
         })
         
+    except HTTPException:
+        raise
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"OCR检测失败: {e}")
         raise HTTPException(status_code=500, detail=f"文字检测失败: {str(e)}")
 
+@router.post("/ocr/detect-stream")
+async def detect_text_stream(file: UploadFile = File(...), language: str = "auto"):
+    """
+    流式检测图片中的文字（Server-Sent Events）
+    
+    检测完成后立即推送全部文字框（boxes事件），之后每完成一个识别批次推送一次
+    该批次的文字（lines事件），最后推送完整结果（done事件）。出错时推送error事件。
+    客户端断开连接时取消尚未开始的识别批次
+    
+    Args:
+        file: 上传的图片文件
+        language: 源语言，auto表示根据首批识别结果自动选择模型
+        
+    Returns:
+        text/event-stream响应
+    """
+    if not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="只支持图片文件")
+    try:
+        ocr_worker_pool.check_language(language)
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    content = await file.read()
+    try:
+        image = await asyncio.to_thread(decode_image_bytes, content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"无效的图像文件: {str(e)}")
+    
+    async def event_stream():
+        try:
+            async for message in ocr_worker_pool.stream_detect(image, language):
+                yield format_sse(message["event"], message["data"])
+        except OCRQueueFullError as e:
+            yield format_sse("error", {"status_code": 503, "message": str(e)})
+        except Exception as e:
+            logger.error(f"流式OCR检测失败: {e}")
+            yield format_sse("error", {"status_code": 500, "message": f"文字检测失败: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/ocr/detect-batch")
+async def detect_text_batch(files: List[UploadFile] = File(...), language: str = "auto"):
+    """
+    批量检测多张图片中的文字
+    
+    Args:
+        files: 上传的图片文件列表
+        language: 源语言，auto表示根据识别结果自动选择模型
+        
+    Returns:
+        按上传顺序排列的文字检测结果
+    """
+    try:
+        for file in files:
+            if not file.content_type.startswith('image/'):
+                raise HTTPException(status_code=400, detail=f"只支持图片文件: {file.filename}")
+        
+        # 直接在内存中解码上传的图片
+        images = []
+        for file in files:
+            content = await file.read()
+            try:
+                images.append(await asyncio.to_thread(decode_image_bytes, content))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"无效的图像文件 {file.filename}: {str(e)}")
+        
+        # 批量文字检测
+        batch_results = await ocr_worker_pool.detect_text_batch(images, language)
+        
+        results = [
+            {
+                "filename": file.filename,
+                "data": text_results,
+                "count": len(text_results)
+            }
+            for file, text_results in zip(files, batch_results)
+        ]
+        
+        return JSONResponse(content={
+            "success": True,
+            "data": results,
+            "message": f"完成 {len(files)} 张图片的文字检测"
+        })
+        
+    except HTTPException:
+        raise
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"批量OCR检测失败: {e}")
+        raise HTTPException(status_code=500, detail=f"批量文字检测失败: {str(e)}")
+
 @router.post("/ocr/detect-from-path")
-async def detect_text_from_path(image_path: str):
+async def detect_text_from_path(image_path: str, language: str = "auto"):
     """
     从指定路径检测图片中的文字
     
     Args:
         image_path: 图片文件路径
+        language: 源语言，auto表示根据识别结果自动选择模型
         
     Returns:
         文字检测结果
@@ -63,7 +180,7 @@ async def detect_text_from_path(image_path: str):
             raise HTTPException(status_code=404, detail="图片文件不存在")
         
         # 进行文字检测
-        text_results = ocr_service.detect_text(image_path)
+        text_results = await ocr_worker_pool.detect_text(image_path, language)
         
         return JSONResponse(content={
             "success": True,
@@ -71,10 +188,60 @@ async def detect_text_from_path(image_path: str):
             "message": f"检测到 {len(text_results)} 个文字区域"
         })
         
+    except HTTPException:
+        raise
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"OCR检测失败: {e}")
         raise HTTPException(status_code=500, detail=f"文字检测失败: {str(e)}")
 
+@router.post("/ocr/recognize-regions")
+async def recognize_regions(request: RecognizeRegionsRequest):
+    """
+    仅识别指定区域内的文字（跳过文字检测）
+    
+    用于区域编辑器修正文字框后重新读取文字，各区域合并为一个识别批次
+    
+    Args:
+        request: 图片路径、区域多边形列表和源语言
+        
+    Returns:
+        与区域顺序一致的识别结果
+    """
+    try:
+        if not os.path.exists(request.image_path):
+            raise HTTPException(status_code=404, detail="图片文件不存在")
+        
+        image = await asyncio.to_thread(cv2.imread, request.image_path)
+        if image is None:
+            raise HTTPException(status_code=400, detail="无法读取图片")
+        
+        try:
+            text_results = await ocr_worker_pool.recognize_regions(image, request.regions, request.language)
+        except UnsupportedLanguageError:
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"无效的区域: {str(e)}")
+        
+        return JSONResponse(content={
+            "success": True,
+            "data": text_results,
+            "message": f"识别 {len(text_results)} 个区域"
+        })
+        
+    except HTTPException:
+        raise
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"区域文字识别失败: {e}")
+        raise HTTPException(status_code=500, detail=f"区域文字识别失败: {str(e)}")
+
 @router.post("/ocr/filter")
 async def filter_ocr_results(results: List[Dict[str, Any]], min_confidence: float = 0.5):
     """
@@ -88,7 +255,7 @@ async def filter_ocr_results(results: List[Dict[str, Any]], min_confidence: floa
         过滤后的结果
     """
     try:
-        filtered_results = ocr_service.filter_results_by_confidence(results, min_confidence)
+        filtered_results = OCRService.filter_results_by_confidence(results, min_confidence)
         
         return JSONResponse(content={
             "success": True,
@@ -100,4 +267,42 @@ async def filter_ocr_results(results: List[Dict[str, Any]], min_confidence: floa
         logger.error(f"结果过滤失败: {e}")
         raise HTTPException(status_code=500, detail=f"结果过滤失败: {str(e)}")
 
-# OCR相关路由将在后续任务中实现 
\ No newline at end of file
+@router.get("/ocr/stats")
+async def get_ocr_stats():
+    """
+    获取OCR进程池统计信息
+    
+    Returns:
+        进程池及各工作进程的任务统计，包括各工作进程已加载的语言模型
+    """
+    try:
+        return JSONResponse(content={
+            "success": True,
+            "data": ocr_worker_pool.get_stats(),
+            "message": "获取OCR统计信息成功"
+        })
+        
+    except Exception as e:
+        logger.error(f"获取OCR统计信息失败: {e}")
+        raise HTTPException(status_code=500, detail=f"获取OCR统计信息失败: {str(e)}") 
+
+@router.delete("/ocr/cache")
+async def clear_ocr_cache():
+    """
+    清空OCR结果缓存（内存层和磁盘层）
+    
+    Returns:
+        清理结果
+    """
+    try:
+        removed = ocr_result_cache.invalidate()
+        
+        return JSONResponse(content={
+            "success": True,
+            "data": {"removed_versions": removed},
+            "message": "OCR缓存已清空"
+        })
+        
+    except Exception as e:
+        logger.error(f"清空OCR缓存失败: {e}")
+        raise HTTPException(status_code=500, detail=f"清空OCR缓存失败: {str(e)}")
\ No newline at end of file
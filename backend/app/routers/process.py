@@ -2,14 +2,20 @@ from fastapi import APIRouter, HTTPException, UploadFile, File
 from fastapi.responses import JSONResponse, FileResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import asyncio
 import os
 import uuid
 import cv2
 import logging
 
-from ..services.ocr_service import ocr_service
+from ..services.ocr_service import OCRService
+from ..services.ocr_worker_pool import ocr_worker_pool, OCRQueueFullError
+from ..services.ocr_model_registry import UnsupportedLanguageError
 from ..services.translation_service import translation_service, TranslationProvider
 from ..services.image_processing_service import image_processing_service
+from ..services.multiframe_service import multiframe_translation_service
+from ..utils.file_utils import decode_image_bytes, get_file_mimetype
+from ..utils.multiframe import open_multiframe
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -27,6 +33,56 @@ class ProcessImageWithRegionsRequest(BaseModel):
     translated_texts: List[str]
     target_language: str = "en"
 
+async def _translate_multiframe(image, output_path: str, target_language: str, source_language: str,
+                                provider: str, min_confidence: float) -> JSONResponse:
+    """多帧图片翻译，返回与单帧流程一致的响应结构"""
+    try:
+        provider_enum = TranslationProvider(provider)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"不支持的翻译提供商: {provider}")
+    
+    try:
+        result = await multiframe_translation_service.translate_frames(
+            image=image,
+            output_path=output_path,
+            target_language=target_language,
+            source_language=source_language,
+            provider=provider_enum,
+            min_confidence=min_confidence
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not result["translation_results"]:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise HTTPException(status_code=400, detail="未检测到文字内容")
+    
+    return JSONResponse(content={
+        "success": True,
+        "data": {
+            "output_image_path": output_path,
+            "translation_results": result["translation_results"],
+            "processing_info": {
+                "total_regions": len(result["translation_results"]),
+                "source_language": source_language,
+                "target_language": target_language,
+                "provider": provider,
+                "min_confidence": min_confidence,
+                "frame_count": result["frame_count"],
+                "processed_frames": result["processed_frames"],
+                "reused_frames": result["reused_frames"],
+                "translation_stats": result["translation_stats"]
+            }
+        },
+        "message": "多帧图片翻译处理完成"
+    })
+
+def _open_multiframe_path(image_path: str):
+    """读取图片文件，多帧图片返回PIL图片对象，否则返回None"""
+    with open(image_path, 'rb') as f:
+        return open_multiframe(f.read())
+
 @router.post("/process/translate-image")
 async def process_translate_image(file: UploadFile = File(...), 
                                 target_language: str = "en",
@@ -46,30 +102,42 @@ async def process_translate_image(file: UploadFile = File(...),
     Returns:
         处理后的图片和相关信息
     """
+    output_path = None
     try:
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="只支持图片文件")
         
-        # 生成唯一文件名
+        # 生成唯一文件名（只有处理结果需要落盘）
         file_id = str(uuid.uuid4())
         file_extension = os.path.splitext(file.filename)[1]
-        input_path = f"uploads/{file_id}_input{file_extension}"
         output_path = f"results/{file_id}_output{file_extension}"
         
-        # 保存上传的文件
-        with open(input_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        content = await file.read()
+        
+        # 多帧图片（GIF/WebP动图、多页TIFF）逐帧处理
+        multiframe_image = await asyncio.to_thread(open_multiframe, content)
+        if multiframe_image is not None:
+            with multiframe_image:
+                output_path = f"results/{file_id}_output{multiframe_translation_service.output_extension(multiframe_image)}"
+                return await _translate_multiframe(
+                    multiframe_image, output_path, target_language, source_language, provider, min_confidence
+                )
+        
+        # 直接在内存中解码上传的图片
+        try:
+            image = await asyncio.to_thread(decode_image_bytes, content)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"无效的图像文件: {str(e)}")
         
         # 步骤1：OCR文字检测
         logger.info("开始OCR文字检测...")
-        text_regions = ocr_service.detect_text(input_path)
+        text_regions = await ocr_worker_pool.detect_text_from_array(image, source_language)
         
         if not text_regions:
             raise HTTPException(status_code=400, detail="未检测到文字内容")
         
         # 步骤2：过滤低置信度结果
-        text_regions = ocr_service.filter_results_by_confidence(text_regions, min_confidence)
+        text_regions = OCRService.filter_results_by_confidence(text_regions, min_confidence)
         
         if not text_regions:
             raise HTTPException(status_code=400, detail="过滤后无有效文字内容")
@@ -84,17 +152,22 @@ async def process_translate_image(file: UploadFile = File(...),
         except ValueError:
             raise HTTPException(status_code=400, detail=f"不支持的翻译提供商: {provider}")
         
-        translated_texts = await translation_service.batch_translate(
+        # 相同文字只翻译一次，数字、价格、网址等无需翻译的文字原样保留
+        translated_texts, translation_stats = await translation_service.batch_translate_with_stats(
             texts=texts_to_translate,
             target_language=target_language,
             source_language=source_language,
             provider=provider_enum
         )
+        logger.info(
+            f"{translation_stats['total']} 个文字区域实际请求翻译 {translation_stats['requested']} 条，"
+            f"节省 {translation_stats['saved_calls']} 次翻译调用"
+        )
         
         # 步骤5：图像处理（移除原文字并渲染翻译文字）
         logger.info("开始图像处理...")
-        processed_image = image_processing_service.process_image(
-            image_path=input_path,
+        processed_image = image_processing_service.process_image_array(
+            image=image,
             text_regions=text_regions,
             translated_texts=translated_texts,
             target_language=target_language
@@ -117,10 +190,6 @@ async def process_translate_image(file: UploadFile = File(...),
                 "translated_text": translated
             })
         
-        # 清理输入文件
-        if os.path.exists(input_path):
-            os.remove(input_path)
-        
         return JSONResponse(content={
             "success": True,
             "data": {
@@ -131,18 +200,24 @@ async def process_translate_image(file: UploadFile = File(...),
                     "source_language": source_language,
                     "target_language": target_language,
                     "provider": provider,
-                    "min_confidence": min_confidence
+                    "min_confidence": min_confidence,
+                    "translation_stats": translation_stats
                 }
             },
             "message": "图片翻译处理完成"
         })
         
+    except HTTPException:
+        raise
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"图片翻译处理失败: {e}")
         # 清理文件
-        for path in [input_path, output_path]:
-            if 'path' in locals() and os.path.exists(path):
-                os.remove(path)
+        if output_path and os.path.exists(output_path):
+            os.remove(output_path)
         raise HTTPException(status_code=500, detail=f"图片翻译处理失败: {str(e)}")
 
 @router.post("/process/from-path")
@@ -165,9 +240,19 @@ async def process_image_from_path(request: ProcessImageRequest):
         file_extension = os.path.splitext(request.image_path)[1]
         output_path = f"results/{file_id}_output{file_extension}"
         
+        # 多帧图片（GIF/WebP动图、多页TIFF）与上传流程一样逐帧处理
+        multiframe_image = await asyncio.to_thread(_open_multiframe_path, request.image_path)
+        if multiframe_image is not None:
+            with multiframe_image:
+                output_path = f"results/{file_id}_output{multiframe_translation_service.output_extension(multiframe_image)}"
+                return await _translate_multiframe(
+                    multiframe_image, output_path, request.target_language, request.source_language,
+                    request.provider, request.min_confidence
+                )
+        
         # OCR检测
-        text_regions = ocr_service.detect_text(request.image_path)
-        text_regions = ocr_service.filter_results_by_confidence(text_regions, request.min_confidence)
+        text_regions = await ocr_worker_pool.detect_text(request.image_path, request.source_language)
+        text_regions = OCRService.filter_results_by_confidence(text_regions, request.min_confidence)
         
         if not text_regions:
             raise HTTPException(status_code=400, detail="未检测到有效文字内容")
@@ -203,6 +288,12 @@ async def process_image_from_path(request: ProcessImageRequest):
             "message": "图片处理完成"
         })
         
+    except HTTPException:
+        raise
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"图片处理失败: {e}")
         raise HTTPException(status_code=500, detail=f"图片处理失败: {str(e)}")
@@ -264,7 +355,7 @@ async def get_processed_image(file_id: str):
     """
     try:
         # 查找文件
-        possible_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
+        possible_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif']
         file_path = None
         
         for ext in possible_extensions:
@@ -276,10 +367,11 @@ async def get_processed_image(file_id: str):
         if not file_path:
             raise HTTPException(status_code=404, detail="处理结果文件不存在")
         
+        # 多帧图片按原格式返回
         return FileResponse(
             path=file_path,
-            media_type="image/jpeg",
-            filename=f"{file_id}_translated.jpg"
+            media_type=get_file_mimetype(file_path),
+            filename=f"{file_id}_translated{os.path.splitext(file_path)[1]}"
         )
         
     except Exception as e:
@@ -299,7 +391,7 @@ async def cleanup_processed_files(file_id: str):
     """
     try:
         deleted_files = []
-        possible_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
+        possible_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif']
         
         # 清理所有相关文件
         for ext in possible_extensions:
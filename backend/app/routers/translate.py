@@ -1,10 +1,14 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import logging
 
 from ..services.translation_service import translation_service, TranslationProvider
+from ..services.translation_memory import translation_memory
+from ..services.http_session_pool import http_session_pool
+from ..utils.sse import format_sse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -63,6 +67,51 @@ async def translate_single_text(request: TranslateRequest):
         logger.error(f"翻译失败: {e}")
         raise HTTPException(status_code=500, detail=f"翻译失败: {str(e)}")
 
+@router.post("/translate/stream")
+async def translate_stream(request: TranslateRequest):
+    """
+    流式翻译单个文本（Server-Sent Events）
+    
+    OpenAI的译文按生成进度逐段推送（chunk事件），不支持流式的提供商推送一个包含完整译文的chunk事件，
+    最后推送完整结果（done事件）。出错时推送error事件
+    
+    Args:
+        request: 翻译请求参数
+        
+    Returns:
+        text/event-stream响应
+    """
+    try:
+        provider = TranslationProvider(request.provider)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"不支持的翻译提供商: {request.provider}")
+    
+    async def event_stream():
+        try:
+            async for message in translation_service.stream_translate(
+                text=request.text,
+                target_language=request.target_language,
+                source_language=request.source_language,
+                provider=provider
+            ):
+                if message["event"] == "done":
+                    message["data"].update({
+                        "original_text": request.text,
+                        "source_language": request.source_language,
+                        "target_language": request.target_language,
+                        "provider": request.provider
+                    })
+                yield format_sse(message["event"], message["data"])
+        except Exception as e:
+            logger.error(f"流式翻译失败: {e}")
+            yield format_sse("error", {"status_code": 500, "message": f"翻译失败: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/translate/batch")
 async def translate_batch_texts(request: BatchTranslateRequest):
     """
@@ -113,6 +162,54 @@ async def translate_batch_texts(request: BatchTranslateRequest):
         logger.error(f"批量翻译失败: {e}")
         raise HTTPException(status_code=500, detail=f"批量翻译失败: {str(e)}")
 
+@router.get("/translate/stats")
+async def get_translation_stats():
+    """
+    获取翻译统计信息
+    
+    Returns:
+        翻译记忆按提供商的命中统计、各提供商的批量翻译统计、HTTP连接池使用情况、各提供商当前的限流状态、相同请求合并统计、对冲统计和长文本分段统计
+    """
+    try:
+        return JSONResponse(content={
+            "success": True,
+            "data": {
+                "translation_memory": translation_memory.stats(),
+                "packed": translation_service.packed_stats(),
+                "http_pool": http_session_pool.stats(),
+                "rate_limits": translation_service.rate_limit_stats(),
+                "coalescing": translation_service.coalesce_stats(),
+                "hedging": translation_service.hedge_stats(),
+                "chunking": translation_service.chunk_stats()
+            },
+            "message": "获取翻译统计信息成功"
+        })
+        
+    except Exception as e:
+        logger.error(f"获取翻译统计信息失败: {e}")
+        raise HTTPException(status_code=500, detail=f"获取翻译统计信息失败: {str(e)}")
+
+@router.delete("/translate/cache")
+async def clear_translation_cache():
+    """
+    清空翻译记忆（内存层和SQLite持久层）
+    
+    Returns:
+        清理结果
+    """
+    try:
+        removed = await asyncio.to_thread(translation_memory.clear)
+        
+        return JSONResponse(content={
+            "success": True,
+            "data": {"removed_entries": removed},
+            "message": "翻译记忆已清空"
+        })
+        
+    except Exception as e:
+        logger.error(f"清空翻译记忆失败: {e}")
+        raise HTTPException(status_code=500, detail=f"清空翻译记忆失败: {str(e)}")
+
 @router.post("/translate/detect-language")
 async def detect_language(text: str):
     """
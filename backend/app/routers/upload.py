@@ -1,6 +1,7 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+import asyncio
 import os
 import uuid
 import shutil
@@ -9,7 +10,8 @@ import aiofiles
 from datetime import datetime
 
 from app.database.database import get_db
-from app.utils.file_utils import validate_image_file, get_image_info
+from app.utils.file_utils import validate_image_file, get_image_info, decode_image_bytes
+from app.utils.image_hash import image_hashes
 
 router = APIRouter()
 
@@ -89,6 +91,12 @@ async def upload_image(
                 detail=f"无效的图像文件: {str(e)}"
             )
         
+        # 计算感知哈希，用于近似重复图片检测
+        try:
+            hashes = await asyncio.to_thread(lambda: image_hashes(decode_image_bytes(file_content)))
+        except ValueError:
+            hashes = {"phash": None, "dhash": None}
+        
         # 创建上传文件记录
         from ..database.models import UploadedFile
         
@@ -101,7 +109,9 @@ async def upload_image(
             width=image_info.get("width"),
             height=image_info.get("height"),
             format=image_info.get("format"),
-            mode=image_info.get("mode")
+            mode=image_info.get("mode"),
+            phash=hashes["phash"],
+            dhash=hashes["dhash"]
         )
         db.add(uploaded_file)
         db.commit()
@@ -118,6 +128,8 @@ async def upload_image(
                     "file_path": file_path,
                     "file_size": len(file_content),
                     "image_info": image_info,
+                    "phash": hashes["phash"],
+                    "dhash": hashes["dhash"],
                     "date_path": get_date_path()  # 返回日期路径信息
                 }
             }
@@ -165,6 +177,7 @@ async def get_upload_history(
                             "width": f.width,
                             "height": f.height,
                             "format": f.format,
+                            "phash": f.phash,
                             "created_at": f.created_at.isoformat()
                         }
                         for f in files
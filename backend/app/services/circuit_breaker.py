@@ -0,0 +1,202 @@
+"""
+翻译服务提供商熔断器
+按滑动时间窗口内的错误率和慢请求比例在关闭、打开、半开三种状态间切换，
+打开期间直接拒绝请求，避免每个请求都等到超时
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from ..core.config_manager import TranslationConfig
+
+# 耗时直方图的桶上界（毫秒），最后一个桶收纳更慢的请求
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class CircuitOpenError(Exception):
+    """提供商熔断中，请求未发出"""
+
+class CircuitBreaker:
+    """单个提供商的熔断器"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, window_seconds: int = 60, min_requests: int = 10,
+                 failure_rate: float = 0.5, slow_call_seconds: float = 10.0,
+                 open_seconds: float = 30.0, half_open_probes: int = 1):
+        """
+        Args:
+            name: 提供商名称
+            window_seconds: 统计错误率和耗时的滑动窗口长度
+            min_requests: 窗口内请求数达到该值后才会打开熔断
+            failure_rate: 失败（含慢请求）比例达到该值时打开熔断
+            slow_call_seconds: 耗时超过该值的成功请求按失败计算
+            open_seconds: 打开后经过该时间进入半开状态
+            half_open_probes: 半开状态下同时放行的探测请求数
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        # 半开周期序号，探测请求据此判断是否属于当前半开周期
+        self._half_open_cycle = 0
+        # 每秒一个桶：[秒, 请求数, 失败数, 慢请求数, 耗时直方图]
+        self._buckets: deque = deque()
+        self._lock = threading.Lock()
+
+        self.opened = 0
+        self.rejected = 0
+        self.failovers = 0
+
+    def configure(self, config: TranslationConfig):
+        """应用提供商配置"""
+        self.window_seconds = config.breaker_window_seconds
+        self.min_requests = config.breaker_min_requests
+        self.failure_rate = config.breaker_failure_rate
+        self.open_seconds = config.breaker_open_seconds
+        self.slow_call_seconds = config.breaker_slow_call_seconds
+
+    def _current_state(self, now: float) -> str:
+        if self.state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self.state = self.HALF_OPEN
+            self._probes = 0
+            self._half_open_cycle += 1
+        return self.state
+
+    def available(self) -> bool:
+        """是否可能放行请求（不占用半开探测名额）"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return state == self.CLOSED or (state == self.HALF_OPEN and self._probes < self.half_open_probes)
+
+    def reject(self) -> CircuitOpenError:
+        """记录一次拒绝并返回对应的异常，用于调用方在available()为False时直接拒绝"""
+        with self._lock:
+            self.rejected += 1
+        return CircuitOpenError(f"{self.name}熔断中，暂不发送请求")
+
+    def before_call(self) -> Optional[int]:
+        """
+        请求前检查，熔断中抛出CircuitOpenError；放行后必须以返回值调用after_call
+
+        Returns:
+            作为半开探测放行时返回所属的半开周期序号，正常放行返回None
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return None
+            if state == self.HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return self._half_open_cycle
+            self.rejected += 1
+        raise CircuitOpenError(f"{self.name}熔断中，暂不发送请求")
+
+    def after_call(self, latency: float, failed: Optional[bool], probe: Optional[int] = None):
+        """
+        记录请求结果
+
+        Args:
+            latency: 请求耗时（秒）
+            failed: 是否失败；None表示不计入错误率（被限流、被取消）
+            probe: before_call的返回值；只有当前半开周期的探测请求释放探测名额并决定熔断状态
+        """
+        now = time.monotonic()
+        with self._lock:
+            is_probe = probe is not None and self.state == self.HALF_OPEN and probe == self._half_open_cycle
+            if is_probe:
+                self._probes -= 1
+            if failed is None:
+                return
+
+            slow = not failed and latency >= self.slow_call_seconds
+            bucket = self._bucket(now)
+            bucket[1] += 1
+            bucket[2] += 1 if failed else 0
+            bucket[3] += 1 if slow else 0
+            bucket[4][self._histogram_index(latency)] += 1
+
+            if self.state == self.HALF_OPEN:
+                # 熔断打开前已放行的请求只记录结果，不决定半开状态的去向
+                if not is_probe:
+                    return
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self.state = self.CLOSED
+                    self._buckets.clear()
+                return
+
+            total, failures, slow_calls = self._totals(now)
+            if self.state == self.CLOSED and total >= self.min_requests and \
+                    (failures + slow_calls) / total >= self.failure_rate:
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = self.OPEN
+        self._opened_at = now
+        self._probes = 0
+        self.opened += 1
+
+    def _bucket(self, now: float) -> List[Any]:
+        second = int(now)
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0, 0, [0] * (len(LATENCY_BUCKETS_MS) + 1)])
+        self._expire(now)
+        return self._buckets[-1]
+
+    def _expire(self, now: float):
+        while self._buckets and self._buckets[0][0] <= now - self.window_seconds:
+            self._buckets.popleft()
+
+    def _totals(self, now: float):
+        self._expire(now)
+        return (sum(bucket[1] for bucket in self._buckets),
+                sum(bucket[2] for bucket in self._buckets),
+                sum(bucket[3] for bucket in self._buckets))
+
+    @staticmethod
+    def _histogram_index(latency: float) -> int:
+        latency_ms = latency * 1000
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                return index
+        return len(LATENCY_BUCKETS_MS)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取熔断状态、窗口内错误率和耗时直方图"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            total, failures, slow_calls = self._totals(now)
+            histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            for bucket in self._buckets:
+                for index, count in enumerate(bucket[4]):
+                    histogram[index] += count
+
+            failure_rate = (failures + slow_calls) / total if total else 0.0
+            labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            return {
+                "state": state,
+                "health_score": 0.0 if state == self.OPEN else round(1 - failure_rate, 4),
+                "window_seconds": self.window_seconds,
+                "requests": total,
+                "failures": failures,
+                "slow_calls": slow_calls,
+                "failure_rate": round(failure_rate, 4),
+                "open_remaining": round(max(0.0, self._opened_at + self.open_seconds - now), 3)
+                if state == self.OPEN else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "failovers": self.failovers,
+                "latency_histogram": dict(zip(labels, histogram))
+            }
@@ -0,0 +1,167 @@
+"""
+翻译服务HTTP连接池
+每个提供商使用一个长期存在的aiohttp会话，复用连接、DNS缓存和keep-alive，并统计连接池使用情况
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from ..core.config_manager import config_manager, TranslationConfig
+
+logger = logging.getLogger(__name__)
+
+def _session_settings(config: Optional[TranslationConfig]) -> Tuple[int, int, int, int]:
+    """影响会话创建的配置项：(连接数上限, keep-alive时间, DNS缓存时间, 超时)"""
+    if config is None:
+        config = TranslationConfig()
+    return (config.connection_limit, config.keepalive_timeout, config.dns_cache_ttl, config.timeout)
+
+class HTTPSessionPool:
+    """按提供商管理的aiohttp会话池"""
+
+    def __init__(self):
+        self._sessions: Dict[str, Tuple[aiohttp.ClientSession, Tuple[int, int, int, int]]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._closing: set = set()
+
+    def _new_stats(self) -> Dict[str, int]:
+        return {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "queued": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0
+        }
+
+    def _trace_config(self, stats: Dict[str, int]) -> aiohttp.TraceConfig:
+        """创建记录请求和连接事件的跟踪配置"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+
+        async def on_request_end(session, context, params):
+            stats["in_flight"] -= 1
+
+        async def on_request_exception(session, context, params):
+            stats["in_flight"] -= 1
+            stats["errors"] += 1
+
+        async def on_connection_queued_start(session, context, params):
+            stats["queued"] += 1
+
+        async def on_connection_create_end(session, context, params):
+            stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            stats["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            stats["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            stats["dns_cache_misses"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    def _create_session(self, provider: str, settings: Tuple[int, int, int, int]) -> aiohttp.ClientSession:
+        connection_limit, keepalive_timeout, dns_cache_ttl, timeout = settings
+        connector = aiohttp.TCPConnector(
+            limit=connection_limit,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=dns_cache_ttl,
+            use_dns_cache=True
+        )
+        stats = self._stats.setdefault(provider, self._new_stats())
+        logger.info(f"创建 {provider} HTTP会话：连接数上限 {connection_limit}，超时 {timeout}s")
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            trace_configs=[self._trace_config(stats)]
+        )
+
+    def get_session(self, provider: str) -> aiohttp.ClientSession:
+        """
+        获取提供商的共享会话
+
+        会话在首次使用时创建；提供商配置的连接参数变化后创建新会话，
+        旧会话在超时时间过后关闭，不影响正在进行的请求
+
+        Args:
+            provider: 翻译服务提供商名称
+        """
+        settings = _session_settings(config_manager.get_translation_config(provider))
+        entry = self._sessions.get(provider)
+        if entry is not None and not entry[0].closed and entry[1] == settings:
+            return entry[0]
+
+        if entry is not None and not entry[0].closed:
+            self._close_later(entry[0], entry[1][3])
+        session = self._create_session(provider, settings)
+        self._sessions[provider] = (session, settings)
+        return session
+
+    def _close_later(self, session: aiohttp.ClientSession, delay: float):
+        async def close():
+            await asyncio.sleep(delay)
+            await session.close()
+
+        task = asyncio.create_task(close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def start(self, providers=None):
+        """
+        为已启用的提供商预先创建会话（在应用生命周期中调用）
+
+        Args:
+            providers: 提供商名称列表，默认为所有已启用且通过HTTP调用的提供商
+        """
+        if providers is None:
+            providers = [p for p in config_manager.get_enabled_providers() if p != "openai"]
+        for provider in providers:
+            self.get_session(provider)
+
+    async def close(self):
+        """关闭所有会话"""
+        for task in list(self._closing):
+            task.cancel()
+        sessions = [session for session, _ in self._sessions.values()]
+        self._sessions.clear()
+        await asyncio.gather(*[session.close() for session in sessions], return_exceptions=True)
+        logger.info(f"已关闭 {len(sessions)} 个翻译服务HTTP会话")
+
+    def stats(self) -> Dict[str, Any]:
+        """获取各提供商的连接池使用情况"""
+        providers = {}
+        for provider, counts in self._stats.items():
+            entry = self._sessions.get(provider)
+            limit = entry[1][0] if entry else 0
+            connections = counts["connections_created"] + counts["connections_reused"]
+            providers[provider] = dict(
+                counts,
+                open=entry is not None and not entry[0].closed,
+                connection_limit=limit,
+                utilization=round(counts["in_flight"] / limit, 4) if limit else 0.0,
+                reuse_rate=round(counts["connections_reused"] / connections, 4) if connections else 0.0
+            )
+        return providers
+
+# 创建全局HTTP连接池实例
+http_session_pool = HTTPSessionPool()
@@ -4,9 +4,6 @@ from PIL import Image, ImageDraw, ImageFont
 import os
 import logging
 from typing import List, Dict, Tuple, Optional
-from skimage import restoration
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 
 logger = logging.getLogger(__name__)
 
@@ -305,6 +302,28 @@ class ImageProcessingService:
             if image is None:
                 raise ValueError(f"无法读取图片: {image_path}")
             
+            return self.process_image_array(image, text_regions, translated_texts, target_language)
+            
+        except Exception as e:
+            logger.error(f"图像处理失败: {e}")
+            # 返回原图
+            return cv2.imread(image_path) if os.path.exists(image_path) else None
+    
+    def process_image_array(self, image: np.ndarray, text_regions: List[Dict], 
+                           translated_texts: List[str], target_language: str = "en") -> np.ndarray:
+        """
+        对内存中的图片数组执行移除原文字并渲染翻译文字
+        
+        Args:
+            image: 原始图片数组
+            text_regions: 文字区域列表
+            translated_texts: 翻译后的文字列表
+            target_language: 目标语言
+            
+        Returns:
+            处理后的图片数组，失败时返回原图
+        """
+        try:
             # 移除原文字
             image_without_text = self.remove_text_from_image(image, text_regions)
             
@@ -317,8 +336,7 @@ class ImageProcessingService:
             
         except Exception as e:
             logger.error(f"图像处理失败: {e}")
-            # 返回原图
-            return cv2.imread(image_path) if os.path.exists(image_path) else None
+            return image
 
 # 创建全局图像处理服务实例
 image_processing_service = ImageProcessingService() 
\ No newline at end of file
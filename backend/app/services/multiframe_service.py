@@ -0,0 +1,153 @@
+"""
+多帧图片翻译服务
+逐帧执行OCR、翻译和图像处理，与上一帧相同或几乎相同的帧直接复用上一帧的处理结果
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from PIL import Image
+
+from ..core.config_manager import config_manager
+from ..utils.image_hash import to_gray
+from ..utils.multiframe import MULTIFRAME_FORMATS, FrameSpool, iter_frames
+from .image_processing_service import image_processing_service
+from .ocr_service import OCRService
+from .ocr_similarity import changed_regions
+from .ocr_worker_pool import ocr_worker_pool
+from .translation_service import translation_service, TranslationProvider
+
+logger = logging.getLogger(__name__)
+
+class MultiFrameTranslationService:
+    """多帧图片翻译服务"""
+
+    async def translate_frames(self, image: Image.Image, output_path: str,
+                               target_language: str = "en",
+                               source_language: str = "auto",
+                               provider: TranslationProvider = TranslationProvider.OPENAI,
+                               min_confidence: float = 0.5) -> Dict[str, Any]:
+        """
+        翻译多帧图片并按原格式输出
+
+        同一时刻只保留当前帧、上一帧的灰度图和上一帧的处理结果，处理后的帧暂存到磁盘。
+        与上一帧没有超过噪声阈值的像素差异时复用上一帧的OCR、翻译和图像处理结果；
+        有变化的帧重新处理，其中未变化区域的OCR结果由近似重复索引复用，
+        已翻译过的文字直接复用译文
+
+        Args:
+            image: 多帧PIL图片对象
+            output_path: 输出路径（扩展名应与图片格式对应）
+            target_language: 目标语言
+            source_language: 源语言
+            provider: 翻译服务提供商
+            min_confidence: 最小置信度
+
+        Returns:
+            包含frame_count、processed_frames、reused_frames、translation_results和translation_stats的字典
+        """
+        max_frames = config_manager.get_image_processing_config().max_frames
+        if image.n_frames > max_frames:
+            raise ValueError(f"帧数 {image.n_frames} 超过上限 {max_frames}")
+
+        start = time.perf_counter()
+        translations: Dict[str, str] = {}
+        translation_results: List[Dict[str, Any]] = []
+        translation_stats = {"total": 0, "duplicates": 0, "untranslatable": 0,
+                             "memory_hits": 0, "coalesced": 0, "requested": 0, "saved_calls": 0}
+        processed_frames = 0
+        reused_frames = 0
+
+        previous_gray = None
+        previous_output = None
+        spool = FrameSpool()
+        try:
+            frames = iter_frames(image)
+            while True:
+                item = await asyncio.to_thread(next, frames, None)
+                if item is None:
+                    break
+                index, frame, duration = item
+
+                gray = to_gray(frame)
+                if previous_gray is not None and previous_gray.shape == gray.shape and \
+                        not await asyncio.to_thread(changed_regions, previous_gray, gray):
+                    await asyncio.to_thread(spool.append, previous_output, duration)
+                    reused_frames += 1
+                    continue
+
+                text_regions = await ocr_worker_pool.detect_text_from_array(frame, source_language)
+                text_regions = OCRService.filter_results_by_confidence(text_regions, min_confidence)
+
+                new_texts = list(dict.fromkeys(
+                    region['text'] for region in text_regions if region['text'] not in translations
+                ))
+                # 之前帧或本帧中已出现过的文字不再翻译
+                translation_stats["total"] += len(text_regions)
+                translation_stats["duplicates"] += len(text_regions) - len(new_texts)
+                translation_stats["saved_calls"] += len(text_regions) - len(new_texts)
+                if new_texts:
+                    translated, batch_stats = await translation_service.batch_translate_with_stats(
+                        texts=new_texts,
+                        target_language=target_language,
+                        source_language=source_language,
+                        provider=provider
+                    )
+                    for name, value in batch_stats.items():
+                        if name != "total":
+                            translation_stats[name] += value
+                    # 每条新文字取其在本帧中首次出现的区域，与单帧结果一样携带bbox和置信度
+                    first_regions = {}
+                    for region in text_regions:
+                        first_regions.setdefault(region['text'], region)
+                    for original, translated_text in zip(new_texts, translated):
+                        translations[original] = translated_text
+                        translation_results.append({
+                            "id": len(translation_results),
+                            "frame": index,
+                            "bbox": first_regions[original]['bbox'],
+                            "confidence": first_regions[original]['confidence'],
+                            "original_text": original,
+                            "translated_text": translated_text
+                        })
+
+                if text_regions:
+                    output = await asyncio.to_thread(
+                        image_processing_service.process_image_array,
+                        frame,
+                        text_regions,
+                        [translations[region['text']] for region in text_regions],
+                        target_language
+                    )
+                else:
+                    output = frame
+
+                await asyncio.to_thread(spool.append, output, duration)
+                previous_gray, previous_output = gray, output
+                processed_frames += 1
+
+            await asyncio.to_thread(spool.write, output_path, image.format, image.info.get("loop", 0))
+        finally:
+            spool.close()
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"多帧图片处理完成：共 {processed_frames + reused_frames} 帧，"
+            f"处理 {processed_frames} 帧，复用 {reused_frames} 帧，耗时 {elapsed:.2f}s"
+        )
+        return {
+            "frame_count": processed_frames + reused_frames,
+            "processed_frames": processed_frames,
+            "reused_frames": reused_frames,
+            "translation_results": translation_results,
+            "translation_stats": translation_stats
+        }
+
+    @staticmethod
+    def output_extension(image: Image.Image) -> str:
+        """多帧图片的输出扩展名"""
+        return MULTIFRAME_FORMATS[image.format]
+
+# 创建全局多帧图片翻译服务实例
+multiframe_translation_service = MultiFrameTranslationService()
@@ -0,0 +1,320 @@
+"""
+OCR结果缓存
+以解码后图片内容的SHA-256和OCR配置指纹为键，包含进程内LRU层和可跨进程共享的磁盘层
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..core.config_manager import config_manager, CacheConfig, OCRConfig
+
+logger = logging.getLogger(__name__)
+
+# 影响OCR输出的配置字段，仅这些字段参与配置指纹
+OCR_FINGERPRINT_FIELDS = (
+    "use_angle_cls",
+    "use_space_char",
+    "det_db_thresh",
+    "det_db_box_thresh",
+    "det_db_unclip_ratio",
+    "rec_batch_num",
+    "lang",
+    "tile_enabled",
+    "tile_size",
+    "tile_overlap",
+    "tile_pixel_threshold",
+    "two_pass_enabled",
+    "two_pass_pixel_threshold",
+    "two_pass_det_side",
+    "two_pass_min_text_height",
+)
+
+# 缓存代次标记文件，失效时更新，各工作进程据此丢弃自己的内存层
+GENERATION_FILE = ".generation"
+
+def ocr_config_fingerprint(config: OCRConfig) -> str:
+    """
+    计算OCR配置指纹
+
+    Args:
+        config: OCR配置
+
+    Returns:
+        16位十六进制指纹
+    """
+    values = asdict(config)
+    payload = json.dumps({field: values[field] for field in OCR_FINGERPRINT_FIELDS}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def image_digest(image_array: np.ndarray) -> str:
+    """
+    计算解码后图片内容的SHA-256
+
+    形状和数据类型一并参与计算，避免不同尺寸的图片字节序列恰好相同
+    """
+    image_array = np.ascontiguousarray(image_array)
+    digest = hashlib.sha256()
+    digest.update(f"{image_array.shape}|{image_array.dtype}".encode('utf-8'))
+    digest.update(image_array.data)
+    return digest.hexdigest()
+
+class OCRResultCache:
+    """OCR结果两级缓存"""
+
+    def __init__(self, cache_dir: str, memory_entries: int = 256,
+                 disk_max_bytes: int = 512 * 1024 * 1024, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.enabled = enabled
+
+        self._memory: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self._generation = self._read_generation()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> "OCRResultCache":
+        """根据缓存配置创建实例"""
+        return cls(
+            cache_dir=config.ocr_cache_dir,
+            memory_entries=config.ocr_memory_entries,
+            disk_max_bytes=config.ocr_disk_max_mb * 1024 * 1024,
+            enabled=config.ocr_cache_enabled
+        )
+
+    def apply_config(self, config: CacheConfig):
+        """应用新的缓存配置"""
+        with self._lock:
+            self.enabled = config.ocr_cache_enabled
+            self.memory_entries = config.ocr_memory_entries
+            self.disk_max_bytes = config.ocr_disk_max_mb * 1024 * 1024
+            if self.cache_dir != config.ocr_cache_dir:
+                self.cache_dir = config.ocr_cache_dir
+                self._memory.clear()
+                self._disk_bytes = None
+                self._generation = self._read_generation()
+            self._trim_memory()
+
+    def _generation_path(self) -> str:
+        return os.path.join(self.cache_dir, GENERATION_FILE)
+
+    def _read_generation(self) -> Optional[str]:
+        try:
+            with open(self._generation_path(), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取OCR缓存代次失败: {e}")
+            return None
+
+    def _sync_generation(self):
+        """其他进程清除缓存后代次标记会变化，此时丢弃本进程的内存层"""
+        generation = self._read_generation()
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self._memory.clear()
+                self._disk_bytes = None
+
+    @staticmethod
+    def make_key(image_array: np.ndarray, fingerprint: str, variant: str = "") -> str:
+        """
+        生成缓存键
+
+        Args:
+            image_array: 解码后的图片数组
+            fingerprint: OCR配置指纹
+            variant: 其他影响结果的参数（如识别语言）
+        """
+        digest = image_digest(image_array)
+        if variant:
+            digest = f"{variant}-{digest}"
+        return f"{fingerprint}/{digest}"
+
+    def _disk_path(self, key: str) -> str:
+        fingerprint, digest = key.split("/", 1)
+        return os.path.join(self.cache_dir, fingerprint, digest[-2:], f"{digest}.json")
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """查询缓存，未命中返回None"""
+        if not self.enabled:
+            return None
+
+        self._sync_generation()
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+            # 更新访问时间，磁盘淘汰按最近访问排序
+            os.utime(path, None)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"读取OCR磁盘缓存失败: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._memory[key] = results
+            self._trim_memory()
+        return results
+
+    def put(self, key: str, results: List[Dict[str, Any]]):
+        """写入缓存（内存层和磁盘层）"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._memory[key] = results
+            self._memory.move_to_end(key)
+            self._trim_memory()
+            self.writes += 1
+
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 先写临时文件再原子替换，避免其他工作进程读到半个文件
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"写入OCR磁盘缓存失败: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_usage()
+            else:
+                self._disk_bytes += size
+            over_limit = self._disk_bytes > self.disk_max_bytes
+        if over_limit:
+            self._prune_disk()
+
+    def _trim_memory(self):
+        while len(self._memory) > max(0, self.memory_entries):
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _iter_disk_entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _scan_disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._iter_disk_entries())
+
+    def _prune_disk(self):
+        """按最近访问时间淘汰磁盘缓存，直到低于容量上限的90%"""
+        entries = sorted(self._iter_disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_max_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except FileNotFoundError:
+                total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+    def invalidate(self, keep_fingerprint: Optional[str] = None) -> int:
+        """
+        清除缓存
+
+        Args:
+            keep_fingerprint: 保留该配置指纹下的磁盘缓存，为None时清除全部
+
+        Returns:
+            删除的磁盘缓存目录数
+        """
+        with self._lock:
+            if keep_fingerprint:
+                for key in [k for k in self._memory if not k.startswith(f"{keep_fingerprint}/")]:
+                    del self._memory[key]
+            else:
+                self._memory.clear()
+            self._disk_bytes = None
+
+        removed = 0
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if name == keep_fingerprint or not os.path.isdir(path):
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+        # 更新代次标记，工作进程在下次查询时丢弃各自的内存层
+        generation = f"{os.getpid()}-{time.time_ns()}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._generation_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(generation)
+            os.replace(tmp_path, self._generation_path())
+        except Exception as e:
+            logger.warning(f"更新OCR缓存代次失败: {e}")
+        else:
+            with self._lock:
+                self._generation = generation
+        logger.info(f"OCR缓存已失效，清除 {removed} 个配置版本")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存命中统计"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.memory_entries,
+                "disk_bytes": self._disk_bytes,
+                "disk_capacity": self.disk_max_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
+
+# 创建全局OCR缓存实例（每个进程一份内存层，磁盘层共享）
+ocr_result_cache = OCRResultCache.from_config(config_manager.get_cache_config())
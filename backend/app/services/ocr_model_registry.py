@@ -0,0 +1,203 @@
+"""
+多语言OCR模型注册表
+按语言按需加载PaddleOCR实例，在内存预算内按LRU淘汰空闲模型
+"""
+import gc
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 应用语言代码 -> PaddleOCR语言代码
+LANGUAGE_MODEL_MAP = {
+    "zh": "ch",
+    "en": "en",
+    "ja": "japan",
+    "ko": "korean",
+    "fr": "fr",
+    "de": "german",
+    "es": "es",
+    "ru": "ru",
+}
+
+# 无法测量进程内存时使用的单个模型内存估算值
+DEFAULT_MODEL_MEMORY_MB = 300
+
+_KANA_PATTERN = re.compile(r'[\u3040-\u309f\u30a0-\u30ff]')
+_HANGUL_PATTERN = re.compile(r'[\uac00-\ud7af]')
+_CYRILLIC_PATTERN = re.compile(r'[\u0400-\u04ff]')
+
+class UnsupportedLanguageError(ValueError):
+    """不支持的OCR语言"""
+
+def resolve_model_language(language: Optional[str], default: str) -> str:
+    """
+    将应用语言代码转换为PaddleOCR语言代码
+
+    Args:
+        language: 应用语言代码（如zh、ja），也可直接传入PaddleOCR语言代码
+        default: 未指定语言或为auto时使用的模型语言
+
+    Raises:
+        UnsupportedLanguageError: 语言不在LANGUAGE_MODEL_MAP中
+    """
+    if not language or language == "auto":
+        return default
+    if language in LANGUAGE_MODEL_MAP:
+        return LANGUAGE_MODEL_MAP[language]
+    if language == default or language in LANGUAGE_MODEL_MAP.values():
+        return language
+    raise UnsupportedLanguageError(
+        f"不支持的OCR语言: {language}，可选: auto, {', '.join(LANGUAGE_MODEL_MAP)}"
+    )
+
+def detect_script_language(texts: Iterable[str]) -> Optional[str]:
+    """
+    根据已识别文字的书写系统推断语言
+
+    默认中文模型能识别汉字和拉丁字母，只有出现假名、谚文或西里尔字母时
+    才需要切换到专用模型；无法判断时返回None
+    """
+    joined = "".join(texts)
+    if _KANA_PATTERN.search(joined):
+        return "ja"
+    if _HANGUL_PATTERN.search(joined):
+        return "ko"
+    if _CYRILLIC_PATTERN.search(joined):
+        return "ru"
+    return None
+
+def _current_rss_mb() -> Optional[float]:
+    """读取当前进程常驻内存（仅Linux），不可用时返回None"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except Exception:
+        return None
+
+class OCRModelRegistry:
+    """按语言管理的OCR模型注册表"""
+
+    def __init__(self, factory: Callable[[str], Any], memory_budget_mb: int = 2048, max_models: int = 3):
+        """
+        Args:
+            factory: 根据PaddleOCR语言代码创建OCR引擎的函数
+            memory_budget_mb: 已加载模型的内存预算
+            max_models: 同时驻留的模型数上限
+        """
+        self.factory = factory
+        self.memory_budget_mb = memory_budget_mb
+        self.max_models = max(1, max_models)
+
+        self._models: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.evictions = 0
+
+    def _resident_memory_mb(self) -> float:
+        return sum(entry["memory_mb"] for entry in self._models.values())
+
+    def _evict_over_budget(self, keep: str):
+        """淘汰最久未使用的空闲模型，直到模型数和内存回到预算内（不淘汰刚加载的模型）"""
+        for lang in list(self._models.keys()):
+            over_count = len(self._models) > self.max_models
+            over_memory = self._resident_memory_mb() > self.memory_budget_mb
+            if not (over_count or over_memory):
+                break
+            entry = self._models[lang]
+            if lang == keep or entry["in_use"] > 0:
+                continue
+            del self._models[lang]
+            self.evictions += 1
+            logger.info(f"淘汰OCR模型: {lang}（驻留 {time.time() - entry['loaded_at']:.0f}s）")
+        gc.collect()
+
+    def _load(self, lang: str) -> Dict[str, Any]:
+        # 新模型加载成功后才淘汰旧模型，加载失败时已加载的模型保持可用
+        rss_before = _current_rss_mb()
+        start = time.perf_counter()
+        engine = self.factory(lang)
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss_mb()
+
+        if rss_before is not None and rss_after is not None and rss_after > rss_before:
+            memory_mb = rss_after - rss_before
+        else:
+            memory_mb = DEFAULT_MODEL_MEMORY_MB
+
+        entry = {
+            "engine": engine,
+            "loaded_at": time.time(),
+            "load_seconds": load_seconds,
+            "memory_mb": memory_mb,
+            "last_used": time.time(),
+            "uses": 0,
+            "in_use": 0
+        }
+        self._models[lang] = entry
+        self.loads += 1
+        logger.info(f"加载OCR模型: {lang}，耗时 {load_seconds:.2f}s，约 {memory_mb:.0f}MB")
+        self._evict_over_budget(keep=lang)
+        return entry
+
+    def get(self, lang: str) -> Any:
+        """获取指定语言的OCR引擎，未加载时按需加载"""
+        with self._lock:
+            entry = self._models.get(lang)
+            if entry is None:
+                entry = self._load(lang)
+            self._models.move_to_end(lang)
+            entry["last_used"] = time.time()
+            return entry["engine"]
+
+    @contextmanager
+    def acquire(self, lang: str):
+        """
+        在使用期间占用指定语言的OCR引擎，占用中的模型不会被淘汰
+        """
+        with self._lock:
+            engine = self.get(lang)
+            entry = self._models[lang]
+            entry["in_use"] += 1
+            entry["uses"] += 1
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                entry["in_use"] -= 1
+
+    def loaded_languages(self):
+        """已加载的模型语言"""
+        with self._lock:
+            return list(self._models.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        """获取模型加载和驻留统计"""
+        with self._lock:
+            now = time.time()
+            return {
+                "memory_budget_mb": self.memory_budget_mb,
+                "max_models": self.max_models,
+                "resident_memory_mb": round(self._resident_memory_mb(), 1),
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "models": [
+                    {
+                        "lang": lang,
+                        "load_seconds": round(entry["load_seconds"], 3),
+                        "memory_mb": round(entry["memory_mb"], 1),
+                        "resident_seconds": round(now - entry["loaded_at"], 1),
+                        "idle_seconds": round(now - entry["last_used"], 1),
+                        "uses": entry["uses"],
+                        "in_use": entry["in_use"]
+                    }
+                    for lang, entry in self._models.items()
+                ]
+            }
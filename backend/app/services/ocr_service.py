@@ -1,65 +1,225 @@
 import cv2
+import functools
 import numpy as np
-from paddleocr import PaddleOCR
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Union, Optional
 import logging
 import os
+import threading
+from contextlib import contextmanager
+
+from ..core.config_manager import config_manager, OCRConfig
+from .ocr_cache import ocr_result_cache, ocr_config_fingerprint
+from .ocr_model_registry import OCRModelRegistry, resolve_model_language, detect_script_language
+from ..utils.ocr_tiling import should_tile, compute_tiles, offset_results, merge_tile_results
 
 logger = logging.getLogger(__name__)
 
+def sort_text_boxes(boxes: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    按从上到下、从左到右的阅读顺序排序文字框（与PaddleOCR内部排序一致）
+    
+    Args:
+        boxes: 文字框列表，每个元素为4x2的坐标数组
+        
+    Returns:
+        排序后的文字框列表
+    """
+    _boxes = sorted(boxes, key=lambda x: (x[0][1], x[0][0]))
+    for i in range(len(_boxes) - 1):
+        for j in range(i, -1, -1):
+            if abs(_boxes[j + 1][0][1] - _boxes[j][0][1]) < 10 and \
+                    (_boxes[j + 1][0][0] < _boxes[j][0][0]):
+                _boxes[j], _boxes[j + 1] = _boxes[j + 1], _boxes[j]
+            else:
+                break
+    return _boxes
+
+@contextmanager
+def detector_side_limit(engine, side: int):
+    """
+    临时修改PaddleOCR检测器的输入缩放上限
+
+    检测器默认把长边缩小到det_limit_side_len（960），两级分辨率识别已自行缩放检测图，
+    需要让检测器按传入图片的实际尺寸检测，否则缩放比例会在检测器内部被还原
+    """
+    resize_ops = [
+        op for op in getattr(engine.text_detector, "preprocess_op", [])
+        if hasattr(op, "limit_side_len") and hasattr(op, "limit_type")
+    ]
+    saved = [(op.limit_side_len, op.limit_type) for op in resize_ops]
+    for op in resize_ops:
+        op.limit_side_len, op.limit_type = side, "max"
+    try:
+        yield
+    finally:
+        for op, (limit_side_len, limit_type) in zip(resize_ops, saved):
+            op.limit_side_len, op.limit_type = limit_side_len, limit_type
+
+def crop_text_region(image: np.ndarray, box: np.ndarray) -> np.ndarray:
+    """
+    对四边形文字区域做透视校正裁剪
+    
+    Args:
+        image: 原始图片数组
+        box: 4x2的文字框坐标（左上、右上、右下、左下）
+        
+    Returns:
+        校正后的文字行图片
+    """
+    points = np.array(box, dtype=np.float32)
+    crop_width = int(max(np.linalg.norm(points[0] - points[1]),
+                         np.linalg.norm(points[2] - points[3])))
+    crop_height = int(max(np.linalg.norm(points[0] - points[3]),
+                          np.linalg.norm(points[1] - points[2])))
+    crop_width = max(crop_width, 1)
+    crop_height = max(crop_height, 1)
+    
+    target = np.float32([[0, 0], [crop_width, 0],
+                         [crop_width, crop_height], [0, crop_height]])
+    matrix = cv2.getPerspectiveTransform(points, target)
+    crop = cv2.warpPerspective(
+        image, matrix, (crop_width, crop_height),
+        borderMode=cv2.BORDER_REPLICATE,
+        flags=cv2.INTER_CUBIC
+    )
+    # 竖排文字旋转为横排后再识别
+    if crop.shape[0] * 1.0 / crop.shape[1] >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
+def polygon_to_quad(polygon: List[List[float]]) -> np.ndarray:
+    """
+    将任意多边形转换为四边形文字框
+    
+    四个点的多边形按原顺序使用；其他多边形取最小外接矩形，
+    并按左上、右上、右下、左下排列
+    
+    Args:
+        polygon: 多边形顶点列表
+        
+    Returns:
+        4x2的文字框坐标
+    """
+    points = np.array(polygon, dtype=np.float32).reshape(-1, 2)
+    if len(points) == 4:
+        return points
+    if len(points) < 3:
+        raise ValueError(f"多边形至少需要3个顶点: {polygon}")
+    
+    corners = sorted(cv2.boxPoints(cv2.minAreaRect(points)).tolist(), key=lambda point: point[0])
+    left = sorted(corners[:2], key=lambda point: point[1])
+    right = sorted(corners[2:], key=lambda point: point[1])
+    return np.array([left[0], right[0], right[1], left[1]], dtype=np.float32)
+
 class OCRService:
-    def __init__(self):
+    def __init__(self, config: Optional[OCRConfig] = None):
         """初始化OCR服务"""
-        self.ocr = None
+        self.ready = False
+        self.config = config or config_manager.get_ocr_config()
+        self.config_fingerprint = ocr_config_fingerprint(self.config)
+        self.result_cache = ocr_result_cache
+        self.registry = self._build_registry(self.config)
         self._init_ocr()
     
+    def _build_registry(self, config: OCRConfig) -> OCRModelRegistry:
+        """按OCR配置创建模型注册表"""
+        return OCRModelRegistry(
+            factory=functools.partial(self._create_engine, config),
+            memory_budget_mb=config.model_memory_budget_mb,
+            max_models=config.max_loaded_models
+        )
+    
+    @staticmethod
+    def _create_engine(config: OCRConfig, lang: str):
+        """按OCR配置创建指定语言的PaddleOCR实例"""
+        # 推理库导入开销大，仅在真正加载模型时导入
+        from paddleocr import PaddleOCR
+        
+        return PaddleOCR(
+            use_angle_cls=config.use_angle_cls,
+            use_space_char=config.use_space_char,
+            det_db_thresh=config.det_db_thresh,
+            det_db_box_thresh=config.det_db_box_thresh,
+            det_db_unclip_ratio=config.det_db_unclip_ratio,
+            rec_batch_num=config.rec_batch_num,
+            lang=lang,
+            use_gpu=False,  # 根据环境调整
+            show_log=False
+        )
+    
     def _init_ocr(self):
-        """初始化PaddleOCR"""
+        """初始化PaddleOCR（预加载默认语言模型）"""
         try:
-            # 支持中英文识别
-            self.ocr = PaddleOCR(
-                use_angle_cls=True,  # 使用角度分类器
-                lang='ch',  # 支持中文
-                use_gpu=False,  # 根据环境调整
-                show_log=False
-            )
+            self.registry.get(self.config.lang)
             logger.info("PaddleOCR初始化成功")
         except Exception as e:
             logger.error(f"PaddleOCR初始化失败: {e}")
             raise e
     
-    def detect_text(self, image_path: str) -> List[Dict[str, Any]]:
+    @property
+    def ocr(self):
+        """默认语言的OCR引擎"""
+        return self.registry.get(self.config.lang)
+    
+    def _warm_up_engine(self, engine):
+        """
+        运行一次空白图片推理，完成推理引擎的首次初始化
+        
+        空白图片检测不到文字，因此再单独对一个空白文字行运行一次分类和识别
+        """
+        self._run_full_ocr(np.full((64, 256, 3), 255, dtype=np.uint8), engine)
+        self._recognize_crops([np.full((48, 320, 3), 255, dtype=np.uint8)], engine)
+    
+    def warm_up(self):
+        """预热默认语言模型"""
+        with self.registry.acquire(self.config.lang) as engine:
+            self._warm_up_engine(engine)
+        self.ready = True
+        logger.info("PaddleOCR预热完成")
+    
+    def reload(self, config: Optional[OCRConfig] = None):
+        """
+        按新配置重建OCR引擎
+        
+        新引擎在独立的模型注册表中加载并预热完成后才替换当前注册表，
+        替换前已取得旧引擎的请求继续在旧引擎上完成
+        
+        Args:
+            config: 新的OCR配置，为None时读取当前配置
+        """
+        try:
+            config = config or config_manager.get_ocr_config()
+            registry = self._build_registry(config)
+            with registry.acquire(config.lang) as engine:
+                self._warm_up_engine(engine)
+            
+            self.config = config
+            self.config_fingerprint = ocr_config_fingerprint(config)
+            self.registry = registry
+            logger.info("OCR引擎已按新配置重新加载")
+            
+        except Exception as e:
+            logger.error(f"OCR引擎重新加载失败: {e}")
+            raise e
+    
+    def _model_language(self, language: Optional[str]) -> str:
+        """将请求语言转换为模型语言，未指定或auto时使用默认模型"""
+        return resolve_model_language(language, self.config.lang)
+    
+    def detect_text(self, image_path: str, language: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         检测图片中的文字
         
         Args:
             image_path: 图片路径
+            language: 源语言（如zh、ja），auto表示按识别结果自动选择模型，None使用默认模型
             
         Returns:
             包含文字信息的列表，每个元素包含bbox、text、confidence
         """
         try:
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"图片文件不存在: {image_path}")
-            
-            # 使用PaddleOCR进行文字检测和识别
-            result = self.ocr.ocr(image_path, cls=True)
-            
-            if not result or not result[0]:
-                return []
-            
-            # 解析结果
-            text_results = []
-            for line in result[0]:
-                if line:
-                    bbox = line[0]  # 边界框坐标
-                    text_info = line[1]  # (文字内容, 置信度)
-                    
-                    text_results.append({
-                        'bbox': bbox,
-                        'text': text_info[0],
-                        'confidence': float(text_info[1])
-                    })
+            image_array = self._load_image(image_path)
+            text_results = self.detect_text_from_array(image_array, language)
             
             logger.info(f"检测到 {len(text_results)} 个文字区域")
             return text_results
@@ -68,46 +228,387 @@ class OCRService:
             logger.error(f"文字检测失败: {e}")
             raise e
     
-    def detect_text_from_array(self, image_array: np.ndarray) -> List[Dict[str, Any]]:
+    def detect_text_from_array(self, image_array: np.ndarray, language: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        从numpy数组检测文字
+        从numpy数组检测文字，结果按图片内容和OCR配置缓存
         
         Args:
             image_array: 图片数组
+            language: 源语言，含义同detect_text
             
         Returns:
             包含文字信息的列表
         """
         try:
-            result = self.ocr.ocr(image_array, cls=True)
+            cache_key = self._cache_key(image_array, language)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
             
-            if not result or not result[0]:
-                return []
+            model_lang = self._model_language(language)
+            with self.registry.acquire(model_lang) as engine:
+                text_results = self._run_ocr(image_array, engine)
             
-            text_results = []
-            for line in result[0]:
-                if line:
-                    bbox = line[0]
-                    text_info = line[1]
-                    
-                    text_results.append({
-                        'bbox': bbox,
-                        'text': text_info[0],
-                        'confidence': float(text_info[1])
-                    })
+            if language == "auto":
+                text_results = self._redetect_by_script(image_array, text_results)
             
+            self.result_cache.put(cache_key, text_results)
             return text_results
             
         except Exception as e:
             logger.error(f"从数组检测文字失败: {e}")
             raise e
     
-    def get_text_regions(self, image_path: str) -> Tuple[List[Dict], np.ndarray]:
+    def _redetect_by_script(self, image_array: np.ndarray, text_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """默认模型的识别结果显示为其他书写系统时，改用对应语言模型重新识别"""
+        detected = detect_script_language(result['text'] for result in text_results)
+        if not detected:
+            return text_results
+        
+        model_lang = self._model_language(detected)
+        if model_lang == self.config.lang:
+            return text_results
+        
+        logger.info(f"自动检测到语言 {detected}，使用 {model_lang} 模型重新识别")
+        with self.registry.acquire(model_lang) as engine:
+            return self._run_ocr(image_array, engine)
+    
+    def _should_tile(self, image_array: np.ndarray) -> bool:
+        """超过像素阈值的图片走分块识别"""
+        height, width = image_array.shape[:2]
+        return self.config.tile_enabled and should_tile(
+            height, width, self.config.tile_size, self.config.tile_pixel_threshold
+        )
+    
+    def detect_text_tiled(self, image_array: np.ndarray, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        分块识别超大图片
+        
+        图片切分为带重叠的图块逐块识别，结果平移回原图坐标并合并重叠区域中的重复框
+        
+        Args:
+            image_array: 图片数组
+            language: 源语言
+            
+        Returns:
+            与detect_text格式一致的文字信息列表
+        """
+        with self.registry.acquire(self._model_language(language)) as engine:
+            return self._run_tiled(image_array, engine)
+    
+    def _run_tiled(self, image_array: np.ndarray, engine) -> List[Dict[str, Any]]:
+        height, width = image_array.shape[:2]
+        tiles = compute_tiles(height, width, self.config.tile_size, self.config.tile_overlap)
+        
+        all_results = []
+        for x, y, w, h in tiles:
+            tile_results = self._run_full_ocr(image_array[y:y + h, x:x + w], engine)
+            all_results.extend(offset_results(tile_results, x, y))
+        
+        merged = merge_tile_results(all_results)
+        logger.info(f"分块识别 {len(tiles)} 个图块，合并后 {len(merged)} 个文字区域")
+        return merged
+    
+    def _should_two_pass(self, image_array: np.ndarray) -> bool:
+        """高像素图片在缩小图上检测"""
+        height, width = image_array.shape[:2]
+        return self.config.two_pass_enabled and \
+            height * width > self.config.two_pass_pixel_threshold and \
+            max(height, width) > self.config.two_pass_det_side
+    
+    def _estimate_detection_scale(self, image_array: np.ndarray, engine) -> Tuple[float, List[np.ndarray]]:
+        """
+        选择检测缩放比例并返回该比例下的文字框
+        
+        先按检测图长边缩放；若检测到的文字中位高度低于下限，说明文字在缩小图中
+        过小，按比例提高分辨率重新检测一次
+        """
+        height, width = image_array.shape[:2]
+        scale = min(1.0, self.config.two_pass_det_side / max(height, width))
+        
+        for attempt in range(2):
+            if scale >= 1.0:
+                return 1.0, self._detect_boxes(image_array, engine, limit_side=max(height, width))
+            
+            small = cv2.resize(image_array, (max(1, round(width * scale)), max(1, round(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+            boxes = self._detect_boxes(small, engine, limit_side=max(small.shape[:2]))
+            if not boxes or attempt > 0:
+                return scale, boxes
+            
+            text_height = float(np.median([
+                min(np.linalg.norm(box[0] - box[3]), np.linalg.norm(box[1] - box[2]))
+                for box in boxes
+            ]))
+            if text_height >= self.config.two_pass_min_text_height:
+                return scale, boxes
+            scale = min(1.0, scale * self.config.two_pass_min_text_height / max(text_height, 1.0))
+        
+        return scale, boxes
+    
+    def _detect_scaled_boxes(self, image_array: np.ndarray, engine) -> List[np.ndarray]:
+        """在缩小图上检测文字，返回还原到原图坐标的文字框"""
+        height, width = image_array.shape[:2]
+        scale, boxes = self._estimate_detection_scale(image_array, engine)
+        
+        full_boxes = []
+        for box in boxes:
+            full_box = np.array(box, dtype=np.float32) / scale
+            full_box[:, 0] = np.clip(full_box[:, 0], 0, width - 1)
+            full_box[:, 1] = np.clip(full_box[:, 1], 0, height - 1)
+            full_boxes.append(full_box)
+        
+        logger.info(f"两级分辨率检测（缩放 {scale:.2f}），检测到 {len(full_boxes)} 个文字框")
+        return full_boxes
+    
+    def detect_text_two_pass(self, image_array: np.ndarray, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        两级分辨率识别：在缩小图上检测文字，再从原图裁剪文字区域识别
+        
+        Args:
+            image_array: 图片数组
+            language: 源语言
+            
+        Returns:
+            与detect_text格式一致的文字信息列表
+        """
+        with self.registry.acquire(self._model_language(language)) as engine:
+            return self._run_two_pass(image_array, engine)
+    
+    def _run_two_pass(self, image_array: np.ndarray, engine) -> List[Dict[str, Any]]:
+        boxes = self._detect_scaled_boxes(image_array, engine)
+        crops = [crop_text_region(image_array, box) for box in boxes]
+        rec_results = self._recognize_crops(crops, engine)
+        
+        text_results = []
+        for box, (text, score) in zip(boxes, rec_results):
+            if score < engine.drop_score:
+                continue
+            text_results.append({
+                'bbox': box.tolist(),
+                'text': text,
+                'confidence': float(score)
+            })
+        return text_results
+    
+    def _run_ocr(self, image_array: np.ndarray, engine) -> List[Dict[str, Any]]:
+        """对图片数组运行OCR，超大图片自动分块，高像素图片走两级分辨率识别"""
+        if self._should_tile(image_array):
+            return self._run_tiled(image_array, engine)
+        if self._should_two_pass(image_array):
+            return self._run_two_pass(image_array, engine)
+        return self._run_full_ocr(image_array, engine)
+    
+    def _run_full_ocr(self, image_array: np.ndarray, engine) -> List[Dict[str, Any]]:
+        """对图片数组运行完整的PaddleOCR检测和识别"""
+        result = engine.ocr(image_array, cls=True)
+        
+        if not result or not result[0]:
+            return []
+        
+        # 解析结果
+        text_results = []
+        for line in result[0]:
+            if line:
+                bbox = line[0]  # 边界框坐标
+                text_info = line[1]  # (文字内容, 置信度)
+                
+                text_results.append({
+                    'bbox': bbox,
+                    'text': text_info[0],
+                    'confidence': float(text_info[1])
+                })
+        
+        return text_results
+    
+    def _cache_key(self, image_array: np.ndarray, language: Optional[str] = None) -> str:
+        """生成图片在当前OCR配置和识别语言下的缓存键"""
+        variant = "auto" if language == "auto" else self._model_language(language)
+        return self.result_cache.make_key(image_array, self.config_fingerprint, variant)
+    
+    def _load_image(self, image: Union[str, np.ndarray]) -> np.ndarray:
+        """读取图片路径或直接返回图片数组"""
+        if isinstance(image, np.ndarray):
+            return image
+        if not os.path.exists(image):
+            raise FileNotFoundError(f"图片文件不存在: {image}")
+        image_array = cv2.imread(image)
+        if image_array is None:
+            raise ValueError(f"无法读取图片: {image}")
+        return image_array
+    
+    def _detect_boxes(self, image_array: np.ndarray, engine, limit_side: Optional[int] = None) -> List[np.ndarray]:
+        """
+        仅运行文字检测，返回按阅读顺序排序的文字框
+        
+        Args:
+            limit_side: 检测器输入长边上限，None时使用检测器默认值
+        """
+        if limit_side is None:
+            dt_boxes, _ = engine.text_detector(image_array)
+        else:
+            with detector_side_limit(engine, limit_side):
+                dt_boxes, _ = engine.text_detector(image_array)
+        if dt_boxes is None or len(dt_boxes) == 0:
+            return []
+        return sort_text_boxes(list(dt_boxes))
+    
+    def _recognize_crops(self, crops: List[np.ndarray], engine) -> List[Tuple[str, float]]:
+        """
+        对文字行图片运行方向分类和识别
+        
+        识别器内部按rec_batch_num分批推理，因此传入的行越多批次越满
+        """
+        if not crops:
+            return []
+        if engine.use_angle_cls:
+            crops, _, _ = engine.text_classifier(crops)
+        rec_res, _ = engine.text_recognizer(crops)
+        return rec_res
+    
+    def detect_text_batch(self, images: List[Union[str, np.ndarray]],
+                          language: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """
+        批量检测多张图片中的文字
+        
+        逐张图片运行检测，再把所有图片裁剪出的文字行汇总到共享的识别批次中，
+        最后按图片拆分结果
+        
+        Args:
+            images: 图片路径或图片数组列表
+            language: 源语言，auto时各图片按识别结果单独切换模型
+            
+        Returns:
+            与输入顺序一致的结果列表，每个元素为该图片的文字信息列表
+        """
+        try:
+            batch_results = [None] * len(images)
+            image_arrays = {}
+            cache_keys = {}
+            all_crops = []
+            owners = []  # (图片序号, 文字框)
+            
+            with self.registry.acquire(self._model_language(language)) as engine:
+                for index, image in enumerate(images):
+                    image_array = self._load_image(image)
+                    cache_key = self._cache_key(image_array, language)
+                    cached = self.result_cache.get(cache_key)
+                    if cached is not None:
+                        batch_results[index] = cached
+                        continue
+                    
+                    image_arrays[index] = image_array
+                    cache_keys[index] = cache_key
+                    if self._should_tile(image_array):
+                        # 超大图片单独分块识别，不参与共享批次
+                        batch_results[index] = self._run_tiled(image_array, engine)
+                        continue
+                    
+                    batch_results[index] = []
+                    if self._should_two_pass(image_array):
+                        boxes = self._detect_scaled_boxes(image_array, engine)
+                    else:
+                        boxes = self._detect_boxes(image_array, engine)
+                    for box in boxes:
+                        all_crops.append(crop_text_region(image_array, box))
+                        owners.append((index, box))
+                
+                rec_results = self._recognize_crops(all_crops, engine)
+                
+                for (index, box), (text, score) in zip(owners, rec_results):
+                    if score < engine.drop_score:
+                        continue
+                    batch_results[index].append({
+                        'bbox': box.tolist(),
+                        'text': text,
+                        'confidence': float(score)
+                    })
+            
+            for index, cache_key in cache_keys.items():
+                if language == "auto":
+                    batch_results[index] = self._redetect_by_script(image_arrays[index], batch_results[index])
+                self.result_cache.put(cache_key, batch_results[index])
+            
+            logger.info(f"批量检测 {len(images)} 张图片，共识别 {len(all_crops)} 个文字行")
+            return batch_results
+            
+        except Exception as e:
+            logger.error(f"批量文字检测失败: {e}")
+            raise e
+    
+    def detect_text_boxes(self, image_array: np.ndarray, language: Optional[str] = None,
+                          use_cache: bool = True) -> Dict[str, Any]:
+        """
+        仅运行文字检测（流式识别的第一阶段）
+        
+        Args:
+            image_array: 图片数组
+            language: 源语言
+            use_cache: 是否先查询结果缓存
+            
+        Returns:
+            包含cache_key、cached（缓存命中时的完整结果）和boxes（按阅读顺序排列的文字框）的字典
+        """
+        try:
+            cache_key = self._cache_key(image_array, language) if use_cache else None
+            cached = self.result_cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                return {"cache_key": cache_key, "cached": cached, "boxes": []}
+            
+            with self.registry.acquire(self._model_language(language)) as engine:
+                if self._should_two_pass(image_array):
+                    boxes = self._detect_scaled_boxes(image_array, engine)
+                else:
+                    boxes = self._detect_boxes(image_array, engine)
+            
+            return {
+                "cache_key": cache_key,
+                "cached": None,
+                "boxes": [np.asarray(box, dtype=np.float32).tolist() for box in boxes]
+            }
+            
+        except Exception as e:
+            logger.error(f"文字检测失败: {e}")
+            raise e
+    
+    def recognize_text_crops(self, crops: List[np.ndarray], language: Optional[str] = None,
+                             drop_low_score: bool = True) -> List[Optional[Tuple[str, float]]]:
+        """
+        对已裁剪的文字行运行方向分类和识别（不做检测）
+        
+        Args:
+            crops: 文字行图片列表
+            language: 源语言，auto时使用默认模型
+            drop_low_score: 低于引擎丢弃阈值的行是否返回None
+            
+        Returns:
+            与输入顺序一致的(文字, 置信度)列表
+        """
+        try:
+            with self.registry.acquire(self._model_language(language)) as engine:
+                rec_results = self._recognize_crops(crops, engine)
+                drop_score = engine.drop_score if drop_low_score else float("-inf")
+            
+            return [
+                (text, float(score)) if score >= drop_score else None
+                for text, score in rec_results
+            ]
+            
+        except Exception as e:
+            logger.error(f"文字行识别失败: {e}")
+            raise e
+    
+    def store_cached_results(self, cache_key: str, text_results: List[Dict[str, Any]]):
+        """写入分阶段识别得到的完整结果"""
+        self.result_cache.put(cache_key, text_results)
+    
+    def get_text_regions(self, image_path: str, language: Optional[str] = None) -> Tuple[List[Dict], np.ndarray]:
         """
         获取文字区域信息和原始图片
         
         Args:
             image_path: 图片路径
+            language: 源语言
             
         Returns:
             (文字区域列表, 图片数组)
@@ -119,7 +620,7 @@ class OCRService:
                 raise ValueError(f"无法读取图片: {image_path}")
             
             # 检测文字
-            text_results = self.detect_text_from_array(image)
+            text_results = self.detect_text_from_array(image, language)
             
             return text_results, image
             
@@ -127,7 +628,8 @@ class OCRService:
             logger.error(f"获取文字区域失败: {e}")
             raise e
     
-    def filter_results_by_confidence(self, results: List[Dict], min_confidence: float = 0.5) -> List[Dict]:
+    @staticmethod
+    def filter_results_by_confidence(results: List[Dict], min_confidence: float = 0.5) -> List[Dict]:
         """
         根据置信度过滤结果
         
@@ -140,5 +642,19 @@ class OCRService:
         """
         return [result for result in results if result['confidence'] >= min_confidence]
 
-# 创建全局OCR服务实例
-ocr_service = OCRService() 
\ No newline at end of file
+_ocr_service: Optional[OCRService] = None
+_ocr_service_lock = threading.Lock()
+
+def get_ocr_service() -> OCRService:
+    """
+    获取全局OCR服务实例
+    
+    模型在首次调用时加载（通常发生在OCR工作进程初始化阶段），
+    导入本模块不会触发模型加载
+    """
+    global _ocr_service
+    if _ocr_service is None:
+        with _ocr_service_lock:
+            if _ocr_service is None:
+                _ocr_service = OCRService()
+    return _ocr_service 
\ No newline at end of file
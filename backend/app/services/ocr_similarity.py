@@ -0,0 +1,256 @@
+"""
+近似重复图片的OCR结果复用
+以感知哈希索引已识别的图片，新图片与某张已识别图片近似时只对差异区域重新识别
+"""
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..core.config_manager import config_manager, CacheConfig
+from ..utils.image_hash import BKTree, phash, dhash, hamming_distance
+
+logger = logging.getLogger(__name__)
+
+Rect = Tuple[int, int, int, int]  # (x1, y1, x2, y2)
+
+def _bbox_rect(bbox: List[List[float]]) -> Rect:
+    points = np.array(bbox, dtype=np.float32)
+    return (int(points[:, 0].min()), int(points[:, 1].min()),
+            int(np.ceil(points[:, 0].max())), int(np.ceil(points[:, 1].max())))
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def _union(a: Rect, b: Rect) -> Rect:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def changed_regions(reference_gray: np.ndarray, gray: np.ndarray,
+                    pixel_threshold: int = 30, min_area: int = 4) -> List[Rect]:
+    """
+    找出两张同尺寸灰度图的差异区域
+
+    Args:
+        reference_gray: 参考图片灰度数组
+        gray: 新图片灰度数组
+        pixel_threshold: 判定像素变化的灰度差阈值，过滤压缩噪声
+        min_area: 忽略面积小于该值的孤立噪点
+
+    Returns:
+        差异区域列表，每个元素为(x1, y1, x2, y2)
+    """
+    diff = cv2.absdiff(reference_gray, gray)
+    _, mask = cv2.threshold(diff, pixel_threshold, 255, cv2.THRESH_BINARY)
+    mask = cv2.dilate(mask, np.ones((3, 3), np.uint8), iterations=2)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+    return [
+        (int(x), int(y), int(x + w), int(y + h))
+        for x, y, w, h, area in stats[1:count]
+        if area >= min_area
+    ]
+
+def expand_regions(regions: List[Rect], results: List[Dict[str, Any]],
+                   width: int, height: int, padding: int = 16) -> List[Rect]:
+    """
+    将差异区域扩展到完整覆盖与之相交的已有文字框，并合并相互重叠的区域
+
+    扩展后已有结果中的文字框要么完全落在某个区域内（需要重新识别），
+    要么与所有区域都不相交（可直接复用）
+    """
+    boxes = [_bbox_rect(result['bbox']) for result in results]
+    expanded = []
+    for x1, y1, x2, y2 in regions:
+        expanded.append((max(0, x1 - padding), max(0, y1 - padding),
+                         min(width, x2 + padding), min(height, y2 + padding)))
+
+    changed = True
+    while changed:
+        changed = False
+        merged: List[Rect] = []
+        for region in expanded:
+            for box in boxes:
+                if _intersects(region, box) and _union(region, box) != region:
+                    region = _union(region, box)
+                    changed = True
+            for index, other in enumerate(merged):
+                if _intersects(region, other):
+                    merged[index] = _union(region, other)
+                    changed = True
+                    break
+            else:
+                merged.append(region)
+        expanded = merged
+    return expanded
+
+class NearDuplicateOCRIndex:
+    """近似重复图片OCR结果索引"""
+
+    def __init__(self, max_entries: int = 64, max_distance: int = 6,
+                 max_diff_ratio: float = 0.25, enabled: bool = True,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 保留的参考图片数
+            max_distance: pHash和dHash判定近似的最大汉明距离
+            max_diff_ratio: 差异区域面积占比超过该值时放弃复用，直接完整识别
+            enabled: 是否启用
+            max_bytes: 参考图片灰度数组占用内存的上限，超过时按LRU淘汰
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.max_diff_ratio = max_diff_ratio
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._tree = BKTree()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.exact_hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.reocr_regions = 0
+        self.reused_results = 0
+
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> "NearDuplicateOCRIndex":
+        """根据缓存配置创建实例"""
+        return cls(
+            max_entries=config.near_dup_entries,
+            max_distance=config.near_dup_max_distance,
+            max_diff_ratio=config.near_dup_max_diff_ratio,
+            enabled=config.near_dup_enabled,
+            max_bytes=config.near_dup_max_mb * 1024 * 1024
+        )
+
+    def apply_config(self, config: CacheConfig):
+        """应用新的缓存配置"""
+        with self._lock:
+            self.enabled = config.near_dup_enabled
+            self.max_entries = config.near_dup_entries
+            self.max_distance = config.near_dup_max_distance
+            self.max_diff_ratio = config.near_dup_max_diff_ratio
+            self.max_bytes = config.near_dup_max_mb * 1024 * 1024
+            self._trim()
+
+    def _trim(self):
+        while self._entries and (len(self._entries) > max(0, self.max_entries) or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry["gray"].nbytes
+        # BK树不支持删除，失效条目过多时重建
+        if self._tree.size > 2 * max(1, self.max_entries):
+            self._tree = BKTree()
+            for entry_id, entry in self._entries.items():
+                self._tree.add(entry["phash"], entry_id)
+
+    def lookup(self, gray: np.ndarray, variant: str) -> Optional[Dict[str, Any]]:
+        """
+        查找与图片近似的已识别图片
+
+        Args:
+            gray: 新图片灰度数组
+            variant: 影响识别结果的参数（OCR配置指纹和识别语言），仅匹配相同参数下的结果
+
+        Returns:
+            匹配的参考条目，包含gray、results；未找到返回None
+        """
+        if not self.enabled:
+            return None
+        image_phash, image_dhash = phash(gray), dhash(gray)
+        with self._lock:
+            for _, entry_id in self._tree.search(image_phash, self.max_distance):
+                entry = self._entries.get(entry_id)
+                if entry is None or entry["variant"] != variant or entry["gray"].shape != gray.shape:
+                    continue
+                if hamming_distance(entry["dhash"], image_dhash) > self.max_distance:
+                    continue
+                self._entries.move_to_end(entry_id)
+                return entry
+        return None
+
+    def add(self, gray: np.ndarray, variant: str, results: List[Dict[str, Any]]):
+        """记录已识别图片及其OCR结果"""
+        if not self.enabled or self.max_entries <= 0 or gray.nbytes > self.max_bytes:
+            return
+        entry = {
+            "phash": phash(gray),
+            "dhash": dhash(gray),
+            "variant": variant,
+            "gray": gray,
+            "results": results
+        }
+        with self._lock:
+            entry_id = next(self._ids)
+            self._entries[entry_id] = entry
+            self._bytes += gray.nbytes
+            self._tree.add(entry["phash"], entry_id)
+            self._trim()
+
+    def plan(self, entry: Dict[str, Any], gray: np.ndarray) -> Optional[Tuple[List[Dict[str, Any]], List[Rect]]]:
+        """
+        计算可复用的结果和需要重新识别的区域
+
+        Returns:
+            (可复用的结果, 需要重新识别的区域)；差异区域过大时返回None
+        """
+        height, width = gray.shape[:2]
+        regions = changed_regions(entry["gray"], gray)
+        if not regions:
+            with self._lock:
+                self.exact_hits += 1
+                self.reused_results += len(entry["results"])
+            return list(entry["results"]), []
+
+        regions = expand_regions(regions, entry["results"], width, height)
+        changed_area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+        if changed_area > self.max_diff_ratio * width * height:
+            return None
+
+        reused = [
+            result for result in entry["results"]
+            if not any(_intersects(_bbox_rect(result['bbox']), region) for region in regions)
+        ]
+        with self._lock:
+            self.partial_hits += 1
+            self.reocr_regions += len(regions)
+            self.reused_results += len(reused)
+        return reused, regions
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def clear(self):
+        """清空索引"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._tree = BKTree()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取近似重复命中统计"""
+        with self._lock:
+            lookups = self.exact_hits + self.partial_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_distance": self.max_distance,
+                "exact_hits": self.exact_hits,
+                "partial_hits": self.partial_hits,
+                "misses": self.misses,
+                "reocr_regions": self.reocr_regions,
+                "reused_results": self.reused_results,
+                "hit_rate": round((self.exact_hits + self.partial_hits) / lookups, 4) if lookups else 0.0
+            }
+
+# 创建全局近似重复索引（位于主进程，参考图片以灰度图保存在内存中）
+near_duplicate_index = NearDuplicateOCRIndex.from_config(config_manager.get_cache_config())
@@ -0,0 +1,626 @@
+"""
+OCR工作进程池
+在独立进程中运行PaddleOCR，避免同步推理阻塞事件循环
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..core.config_manager import config_manager, OCRConfig, CacheConfig
+from ..utils.ocr_tiling import should_tile, compute_tiles, offset_results, merge_tile_results
+from ..utils.image_hash import to_gray
+from .ocr_cache import ocr_config_fingerprint, ocr_result_cache
+from .ocr_model_registry import resolve_model_language, detect_script_language, UnsupportedLanguageError
+from .ocr_service import crop_text_region, polygon_to_quad
+from .ocr_similarity import near_duplicate_index
+
+logger = logging.getLogger(__name__)
+
+# 等待其他工作进程完成预热的最长时间（秒）
+WARM_UP_BARRIER_TIMEOUT = 600
+
+# 工作进程内持有的OCR服务实例
+_worker_service = None
+# 预热屏障，保证预热任务分别落在不同的工作进程上
+_warm_up_barrier = None
+
+def _init_worker(ocr_config: Optional[Dict[str, Any]] = None,
+                 cache_config: Optional[Dict[str, Any]] = None,
+                 warm_up_barrier=None):
+    """
+    工作进程初始化：加载PaddleOCR模型并预热
+
+    Args:
+        ocr_config: 主进程传入的OCR配置，确保重新加载时工作进程使用最新配置
+        cache_config: 主进程传入的缓存配置，缓存开关、容量和目录变化后随重新加载生效
+        warm_up_barrier: 参与方数等于工作进程数的屏障，供预热任务使用
+    """
+    global _worker_service, _warm_up_barrier
+    _warm_up_barrier = warm_up_barrier
+    from .ocr_service import get_ocr_service
+    if ocr_config is not None:
+        config_manager.ocr_config = OCRConfig(**ocr_config)
+    if cache_config is not None:
+        config_manager.cache_config = CacheConfig(**cache_config)
+        ocr_result_cache.apply_config(config_manager.cache_config)
+    _worker_service = get_ocr_service()
+    _worker_service.warm_up()
+
+def _ping_worker() -> int:
+    """
+    预热任务：在屏障处等待，直到每个工作进程都各自领取了一个预热任务
+
+    工作进程在初始化函数中加载模型，领取任务时已完成预热；屏障使先完成初始化的工作进程
+    无法连续领取多个预热任务，从而保证所有工作进程都已启动并预热
+    """
+    if _warm_up_barrier is not None:
+        _warm_up_barrier.wait(WARM_UP_BARRIER_TIMEOUT)
+    return os.getpid()
+
+def _run_in_worker(method: str, args: tuple) -> Dict[str, Any]:
+    """
+    在工作进程中调用OCRService的方法
+
+    异常在进程内捕获并以字符串返回，以便主进程按工作进程统计失败次数
+    """
+    start = time.perf_counter()
+    try:
+        result = getattr(_worker_service, method)(*args)
+        error = None
+    except Exception as e:
+        result = None
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "pid": os.getpid(),
+        "elapsed": time.perf_counter() - start,
+        "result": result,
+        "error": error,
+        "cache": _worker_service.result_cache.stats(),
+        "models": _worker_service.registry.stats()
+    }
+
+class OCRQueueFullError(Exception):
+    """OCR任务队列已满"""
+
+class OCRWorkerError(Exception):
+    """OCR工作进程执行失败"""
+
+class OCRWorkerPool:
+    """OCR工作进程池"""
+
+    def __init__(self, worker_count: Optional[int] = None, max_queue_size: Optional[int] = None):
+        ocr_config = config_manager.get_ocr_config()
+        if worker_count is None:
+            worker_count = ocr_config.worker_count
+        if max_queue_size is None:
+            max_queue_size = ocr_config.max_queue_size
+
+        self.worker_count = worker_count if worker_count > 0 else (os.cpu_count() or 1)
+        self.max_queue_size = max(0, max_queue_size)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.ready = False
+        self.warmup_seconds: Optional[float] = None
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+
+        # 在事件循环中首次使用时创建，Python 3.9的asyncio.Lock会绑定创建时的事件循环
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self.reloading = False
+        self.reloads = 0
+        self.last_reload_seconds: Optional[float] = None
+        self.last_reload_error: Optional[str] = None
+
+    def _create_executor(self, worker_count: int) -> ProcessPoolExecutor:
+        """创建进程池（使用spawn避免fork已加载的推理库），工作进程使用当前OCR配置"""
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(
+            max_workers=worker_count,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(asdict(config_manager.get_ocr_config()), asdict(config_manager.get_cache_config()),
+                      context.Barrier(worker_count))
+        )
+        logger.info(f"OCR进程池已创建，工作进程数: {worker_count}")
+        return executor
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self._create_executor(self.worker_count)
+        return self._executor
+
+    @staticmethod
+    async def _warm_up_executor(executor: ProcessPoolExecutor, worker_count: int) -> List[int]:
+        """向每个工作进程各提交一个预热任务，等待全部完成模型加载和预热"""
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*[
+            loop.run_in_executor(executor, _ping_worker)
+            for _ in range(worker_count)
+        ])
+
+    async def start(self):
+        """启动进程池并等待所有工作进程完成模型加载"""
+        executor = self._ensure_executor()
+        start = time.perf_counter()
+        pids = await self._warm_up_executor(executor, self.worker_count)
+        for pid in pids:
+            self._get_worker_stats(pid)
+        self.warmup_seconds = time.perf_counter() - start
+        self.ready = True
+        logger.info(f"OCR进程池预热完成，耗时 {self.warmup_seconds:.2f}s")
+
+    async def reload(self):
+        """
+        按当前OCR配置和缓存配置无停机重建工作进程
+
+        新进程池在后台加载模型并预热完成后才替换旧进程池；旧进程池不再接收新任务，
+        已提交的任务在旧引擎上执行完毕后其工作进程退出。新进程池启动失败时继续使用旧进程池
+        """
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+        async with self._reload_lock:
+            if self._executor is None:
+                # 进程池尚未启动，下次启动时直接使用新配置
+                return
+
+            ocr_config = config_manager.get_ocr_config()
+            worker_count = ocr_config.worker_count if ocr_config.worker_count > 0 else (os.cpu_count() or 1)
+            self.reloading = True
+            start = time.perf_counter()
+            executor = self._create_executor(worker_count)
+            try:
+                pids = await self._warm_up_executor(executor, worker_count)
+            except Exception as e:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.last_reload_error = f"{type(e).__name__}: {e}"
+                logger.error(f"OCR进程池重新加载失败，继续使用旧进程池: {e}")
+                raise
+            finally:
+                self.reloading = False
+
+            old_executor = self._executor
+            self._executor = executor
+            self.worker_count = worker_count
+            self.max_queue_size = max(0, ocr_config.max_queue_size)
+            self._worker_stats = {}
+            for pid in pids:
+                self._get_worker_stats(pid)
+            old_executor.shutdown(wait=False)
+
+            self.reloads += 1
+            self.last_reload_seconds = time.perf_counter() - start
+            self.last_reload_error = None
+            logger.info(f"OCR进程池已切换到新配置，耗时 {self.last_reload_seconds:.2f}s")
+
+    def schedule_reload(self):
+        """在后台重新加载进程池，连续的配置更新按顺序应用"""
+        async def _reload():
+            try:
+                await self.reload()
+            except Exception:
+                pass  # 已记录在last_reload_error中
+
+        self._reload_task = asyncio.create_task(_reload())
+
+    def shutdown(self, wait: bool = True):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            self.ready = False
+            logger.info("OCR进程池已关闭")
+
+    def _get_worker_stats(self, pid: int) -> Dict[str, Any]:
+        if pid not in self._worker_stats:
+            self._worker_stats[pid] = {
+                "pid": pid,
+                "tasks": 0,
+                "failures": 0,
+                "total_time": 0.0,
+                "last_active": None,
+                "cache": None,
+                "models": None
+            }
+        return self._worker_stats[pid]
+
+    def _record(self, response: Dict[str, Any]):
+        stats = self._get_worker_stats(response["pid"])
+        stats["tasks"] += 1
+        stats["total_time"] += response["elapsed"]
+        stats["last_active"] = time.time()
+        stats["cache"] = response["cache"]
+        stats["models"] = response["models"]
+        if response["error"]:
+            stats["failures"] += 1
+
+    async def run(self, method: str, *args) -> Any:
+        """
+        提交OCR任务到工作进程并等待结果
+
+        Args:
+            method: OCRService的方法名
+            *args: 方法参数
+
+        Returns:
+            方法返回值
+        """
+        if self._pending >= self.worker_count + self.max_queue_size:
+            self._rejected += 1
+            raise OCRQueueFullError(f"OCR任务队列已满（上限 {self.max_queue_size}）")
+
+        executor = self._ensure_executor()
+        loop = asyncio.get_running_loop()
+
+        self._pending += 1
+        self._submitted += 1
+        try:
+            response = await loop.run_in_executor(executor, _run_in_worker, method, args)
+        except asyncio.CancelledError:
+            # 调用方取消（如流式识别的客户端断开），尚未开始执行的任务不会再运行
+            self._cancelled += 1
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._record(response)
+        if response["error"]:
+            self._failed += 1
+            raise OCRWorkerError(response["error"])
+
+        self._completed += 1
+        return response["result"]
+
+    @staticmethod
+    def check_language(language: Optional[str]):
+        """
+        校验OCR语言，在提交到工作进程前拒绝不支持的语言
+
+        Raises:
+            UnsupportedLanguageError: 语言不在LANGUAGE_MODEL_MAP中
+        """
+        resolve_model_language(language, config_manager.get_ocr_config().lang)
+
+    def _should_tile(self, height: int, width: int) -> bool:
+        ocr_config = config_manager.get_ocr_config()
+        return ocr_config.tile_enabled and should_tile(
+            height, width, ocr_config.tile_size, ocr_config.tile_pixel_threshold
+        )
+
+    async def detect_text(self, image_path: str, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """在工作进程中检测图片文件中的文字，超大图片分块并行识别，近似重复图片复用已有结果"""
+        self.check_language(language)
+        try:
+            # 仅读取文件头获取尺寸
+            with Image.open(image_path) as img:
+                width, height = img.size
+        except Exception:
+            # 交由工作进程按原流程报错
+            return await self.run("detect_text", image_path, language)
+
+        if self._should_tile(height, width) or near_duplicate_index.enabled:
+            # 超大图片分块识别、近似重复图片复用结果都需要在主进程中读取图片
+            image_array = await asyncio.to_thread(cv2.imread, image_path)
+            if image_array is not None:
+                return await self.detect_text_from_array(image_array, language)
+        return await self.run("detect_text", image_path, language)
+
+    async def detect_text_from_array(self, image_array: np.ndarray,
+                                     language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """在工作进程中检测图片数组中的文字，超大图片分块并行识别"""
+        self.check_language(language)
+        height, width = image_array.shape[:2]
+        if self._should_tile(height, width):
+            return await self.detect_text_tiled(image_array, language)
+        if near_duplicate_index.enabled:
+            return await self.detect_text_near_duplicate(image_array, language)
+        return await self.run("detect_text_from_array", image_array, language)
+
+    async def detect_text_near_duplicate(self, image_array: np.ndarray,
+                                         language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        复用近似重复图片的OCR结果，只把差异区域送入工作进程识别
+
+        与已识别图片完全一致时直接返回已有结果；差异区域过大或没有近似图片时完整识别
+        """
+        variant = f"{ocr_config_fingerprint(config_manager.get_ocr_config())}/{language or ''}"
+        gray = await asyncio.to_thread(to_gray, image_array)
+        entry = await asyncio.to_thread(near_duplicate_index.lookup, gray, variant)
+        plan = await asyncio.to_thread(near_duplicate_index.plan, entry, gray) if entry else None
+
+        if plan is None:
+            near_duplicate_index.record_miss()
+            results = await self.run("detect_text_from_array", image_array, language)
+        else:
+            reused, regions = plan
+            if not regions:
+                return reused
+
+            semaphore = asyncio.Semaphore(self.worker_count)
+
+            async def _run_region(x1: int, y1: int, x2: int, y2: int) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    crop = np.ascontiguousarray(image_array[y1:y2, x1:x2])
+                    region_results = await self.run("detect_text_from_array", crop, language)
+                return offset_results(region_results, x1, y1)
+
+            region_results = await asyncio.gather(*[_run_region(*region) for region in regions])
+            results = merge_tile_results(reused + [result for results in region_results for result in results])
+            logger.info(f"近似重复图片：复用 {len(reused)} 个文字区域，重新识别 {len(regions)} 个差异区域")
+
+        await asyncio.to_thread(near_duplicate_index.add, gray, variant, results)
+        return results
+
+    async def detect_text_tiled(self, image_array: np.ndarray,
+                                language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        将超大图片切分为重叠图块，分发到各工作进程并行识别后合并
+
+        同一请求同时在途的图块数不超过工作进程数，避免单个大图占满任务队列
+        """
+        ocr_config = config_manager.get_ocr_config()
+        height, width = image_array.shape[:2]
+        tiles = compute_tiles(height, width, ocr_config.tile_size, ocr_config.tile_overlap)
+        semaphore = asyncio.Semaphore(self.worker_count)
+
+        async def _run_tile(x: int, y: int, w: int, h: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                tile = np.ascontiguousarray(image_array[y:y + h, x:x + w])
+                tile_results = await self.run("detect_text_from_array", tile, language)
+            return offset_results(tile_results, x, y)
+
+        tile_results = await asyncio.gather(*[_run_tile(*tile) for tile in tiles])
+        merged = merge_tile_results([result for results in tile_results for result in results])
+        logger.info(f"分块并行识别 {len(tiles)} 个图块，合并后 {len(merged)} 个文字区域")
+        return merged
+
+    async def detect_text_batch(self, images: List[Union[str, np.ndarray]],
+                                language: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """
+        批量检测多张图片中的文字
+        
+        图片按工作进程数分组，每组在一个工作进程内走共享识别批次，各组并行执行
+        """
+        if not images:
+            return []
+        self.check_language(language)
+        group_size = max(1, -(-len(images) // self.worker_count))
+        groups = [images[i:i + group_size] for i in range(0, len(images), group_size)]
+        group_results = await asyncio.gather(*[
+            self.run("detect_text_batch", group, language) for group in groups
+        ])
+        return [result for group in group_results for result in group]
+
+    async def recognize_regions(self, image_array: np.ndarray, polygons: List[List[List[float]]],
+                                language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        仅识别指定区域内的文字，跳过文字检测
+
+        区域在主进程中透视校正裁剪，只把文字行图片发送到工作进程并在同一批次中识别
+
+        Returns:
+            与输入顺序一致的结果列表，每个元素包含bbox、text、confidence
+        """
+        self.check_language(language)
+
+        def _crop():
+            boxes = [polygon_to_quad(polygon) for polygon in polygons]
+            return boxes, [crop_text_region(image_array, box) for box in boxes]
+
+        boxes, crops = await asyncio.to_thread(_crop)
+        if not crops:
+            return []
+
+        model_language = None if language == "auto" else language
+        rec_results = await self.run("recognize_text_crops", crops, model_language, False)
+        if language == "auto":
+            detected = detect_script_language(text for text, _ in rec_results)
+            default_lang = config_manager.get_ocr_config().lang
+            if detected and resolve_model_language(detected, default_lang) != default_lang:
+                rec_results = await self.run("recognize_text_crops", crops, detected, False)
+
+        return [
+            {"bbox": box.tolist(), "text": text, "confidence": score}
+            for box, (text, score) in zip(boxes, rec_results)
+        ]
+
+    async def _detect_tiled_boxes(self, image_array: np.ndarray, language: Optional[str]) -> List[List[List[float]]]:
+        """超大图片分块并行检测文字框，平移回原图坐标并去除重叠区域中的重复框"""
+        ocr_config = config_manager.get_ocr_config()
+        height, width = image_array.shape[:2]
+        tiles = compute_tiles(height, width, ocr_config.tile_size, ocr_config.tile_overlap)
+        semaphore = asyncio.Semaphore(self.worker_count)
+
+        async def _detect_tile(x: int, y: int, w: int, h: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                tile = np.ascontiguousarray(image_array[y:y + h, x:x + w])
+                detection = await self.run("detect_text_boxes", tile, language, False)
+            return offset_results([{"bbox": box, "confidence": 1.0} for box in detection["boxes"]], x, y)
+
+        tile_boxes = await asyncio.gather(*[_detect_tile(*tile) for tile in tiles])
+        merged = merge_tile_results([box for boxes in tile_boxes for box in boxes])
+        return [item["bbox"] for item in merged]
+
+    async def stream_detect(self, image_array: np.ndarray,
+                            language: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        分阶段流式识别
+
+        先在一个工作进程中完成文字检测并返回全部文字框，再把文字行按识别批次分发到各工作进程，
+        每个批次完成即返回。生成器被关闭（如客户端断开连接）时取消尚未开始的识别批次
+
+        Yields:
+            {"event": 事件名, "data": 数据}，事件依次为boxes、lines（每批一次）、done
+        """
+        self.check_language(language)
+        start = time.perf_counter()
+        height, width = image_array.shape[:2]
+
+        cache_key = None
+        if self._should_tile(height, width):
+            boxes = await self._detect_tiled_boxes(image_array, language)
+        else:
+            detection = await self.run("detect_text_boxes", image_array, language)
+            cache_key = detection["cache_key"]
+            if detection["cached"] is not None:
+                cached = detection["cached"]
+                yield {"event": "boxes", "data": {
+                    "count": len(cached),
+                    "boxes": [result["bbox"] for result in cached],
+                    "elapsed": round(time.perf_counter() - start, 3)
+                }}
+                yield {"event": "lines", "data": {
+                    "batch": 0,
+                    "results": [dict(result, index=index) for index, result in enumerate(cached)]
+                }}
+                yield {"event": "done", "data": {
+                    "count": len(cached),
+                    "results": cached,
+                    "cached": True,
+                    "elapsed": round(time.perf_counter() - start, 3)
+                }}
+                return
+            boxes = detection["boxes"]
+
+        yield {"event": "boxes", "data": {
+            "count": len(boxes),
+            "boxes": boxes,
+            "elapsed": round(time.perf_counter() - start, 3)
+        }}
+
+        crops = await asyncio.to_thread(
+            lambda: [crop_text_region(image_array, np.array(box, dtype=np.float32)) for box in boxes]
+        )
+        batch_size = max(1, config_manager.get_ocr_config().rec_batch_num)
+        batches = [list(range(i, min(i + batch_size, len(crops)))) for i in range(0, len(crops), batch_size)]
+        recognized: List[Optional[Dict[str, Any]]] = [None] * len(boxes)
+
+        def _batch_event(batch_index: int, indices: List[int], rec_results: List) -> Dict[str, Any]:
+            results = []
+            for index, rec in zip(indices, rec_results):
+                if rec is None:
+                    continue
+                recognized[index] = {"bbox": boxes[index], "text": rec[0], "confidence": rec[1]}
+                results.append(dict(recognized[index], index=index))
+            return {"event": "lines", "data": {"batch": batch_index, "results": results}}
+
+        model_language = language
+        remaining = list(enumerate(batches))
+        if language == "auto" and remaining:
+            # 自动语言：先识别第一批，根据书写系统确定其余批次使用的模型
+            batch_index, indices = remaining.pop(0)
+            first_crops = [crops[i] for i in indices]
+            rec_results = await self.run("recognize_text_crops", first_crops, None)
+            detected = detect_script_language(rec[0] for rec in rec_results if rec)
+            default_lang = config_manager.get_ocr_config().lang
+            if detected and resolve_model_language(detected, default_lang) != default_lang:
+                model_language = detected
+                rec_results = await self.run("recognize_text_crops", first_crops, model_language)
+            else:
+                model_language = None
+            yield _batch_event(batch_index, indices, rec_results)
+
+        semaphore = asyncio.Semaphore(self.worker_count)
+
+        async def _recognize(batch_index: int, indices: List[int]):
+            async with semaphore:
+                rec_results = await self.run("recognize_text_crops", [crops[i] for i in indices], model_language)
+            return batch_index, indices, rec_results
+
+        tasks = [asyncio.create_task(_recognize(batch_index, indices)) for batch_index, indices in remaining]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield _batch_event(*(await next_done))
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        text_results = [result for result in recognized if result is not None]
+        if cache_key:
+            await self.run("store_cached_results", cache_key, text_results)
+        yield {"event": "done", "data": {
+            "count": len(text_results),
+            "results": text_results,
+            "cached": False,
+            "elapsed": round(time.perf_counter() - start, 3)
+        }}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        汇总各工作进程的OCR结果缓存统计
+
+        OCR只在工作进程中执行，主进程的缓存实例不处理查询；各工作进程的统计随每次任务返回
+        """
+        totals = {"memory_entries": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0,
+                  "writes": 0, "evictions": 0}
+        disk_bytes = None
+        for stats in self._worker_stats.values():
+            if stats["cache"]:
+                for field in totals:
+                    totals[field] += stats["cache"][field]
+                if stats["cache"]["disk_bytes"] is not None:
+                    # 磁盘层由所有工作进程共享，取最新的统计值
+                    disk_bytes = stats["cache"]["disk_bytes"]
+        lookups = totals["memory_hits"] + totals["disk_hits"] + totals["misses"]
+        cache_config = config_manager.get_cache_config()
+        totals.update({
+            "enabled": cache_config.ocr_cache_enabled,
+            "memory_capacity": cache_config.ocr_memory_entries,
+            "disk_bytes": disk_bytes,
+            "disk_capacity": cache_config.ocr_disk_max_mb * 1024 * 1024,
+            "workers": sum(1 for stats in self._worker_stats.values() if stats["cache"]),
+            "hit_rate": round((totals["memory_hits"] + totals["disk_hits"]) / lookups, 4) if lookups else 0.0
+        })
+        return totals
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取进程池及各工作进程统计信息"""
+        workers = []
+        for stats in self._worker_stats.values():
+            worker = dict(stats)
+            worker["total_time"] = round(stats["total_time"], 3)
+            worker["avg_time"] = round(stats["total_time"] / stats["tasks"], 3) if stats["tasks"] else 0.0
+            workers.append(worker)
+
+        return {
+            "running": self._executor is not None,
+            "ready": self.ready,
+            "warmup_seconds": round(self.warmup_seconds, 3) if self.warmup_seconds is not None else None,
+            "worker_count": self.worker_count,
+            "max_queue_size": self.max_queue_size,
+            "active_tasks": min(self._pending, self.worker_count),
+            "queued_tasks": max(0, self._pending - self.worker_count),
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "cancelled": self._cancelled,
+            "reloading": self.reloading,
+            "reloads": self.reloads,
+            "last_reload_seconds": round(self.last_reload_seconds, 3) if self.last_reload_seconds is not None else None,
+            "last_reload_error": self.last_reload_error,
+            "cache": self.cache_stats(),
+            "near_duplicate": near_duplicate_index.stats(),
+            "workers": workers
+        }
+
+# 创建全局OCR进程池实例（进程在应用启动时创建）
+ocr_worker_pool = OCRWorkerPool()
@@ -0,0 +1,240 @@
+"""
+翻译服务提供商限流
+按提供商限制并发数、每分钟请求数和token数，并根据限流和超时自适应调整并发上限
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+class ConcurrencyLimiter:
+    """可调整上限的异步并发限制器"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self.waiting = 0
+        self.peak_active = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def set_limit(self, limit: int):
+        """调整并发上限；调低时正在进行的请求不受影响，新请求等待到低于上限"""
+        self.limit = max(1, limit)
+
+    @asynccontextmanager
+    async def slot(self):
+        """占用一个并发名额"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        condition = self._condition
+
+        async with condition:
+            self.waiting += 1
+            try:
+                await condition.wait_for(lambda: self.active < self.limit)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            yield
+        finally:
+            async with condition:
+                self.active -= 1
+                condition.notify(max(1, self.limit - self.active))
+
+    def stats(self) -> Dict[str, Any]:
+        """获取并发使用情况"""
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "peak_active": self.peak_active
+        }
+
+class RateLimitedError(Exception):
+    """提供商拒绝请求（HTTP 429或等价的错误码）"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析Retry-After响应头（秒数或HTTP日期），无法解析时返回None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    """
+    异步令牌桶
+
+    按rate_per_minute匀速补充，容量为一秒的补充量；单次需求超过容量时允许透支，
+    后续请求等待透支部分补足。rate_per_minute为0表示不限制
+    """
+
+    def __init__(self, rate_per_minute: float = 0):
+        self.rate_per_minute = 0.0
+        self.capacity = 1.0
+        self.tokens = 1.0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self.configure(rate_per_minute)
+
+    def configure(self, rate_per_minute: float):
+        """调整补充速率"""
+        if rate_per_minute == self.rate_per_minute:
+            return
+        self._refill()
+        self.rate_per_minute = max(0.0, float(rate_per_minute))
+        self.capacity = max(1.0, self.rate_per_minute / 60)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate_per_minute > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_minute / 60)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1):
+        """取出amount个令牌，不足时按到达顺序等待"""
+        if self.rate_per_minute <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            start = time.monotonic()
+            while True:
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    break
+                await asyncio.sleep((needed - self.tokens) * 60 / self.rate_per_minute)
+            waited = time.monotonic() - start
+            if waited > 0.001:
+                self.waits += 1
+                self.wait_seconds += waited
+
+    def stats(self) -> Dict[str, Any]:
+        """获取令牌桶状态"""
+        self._refill()
+        return {
+            "rate_per_minute": self.rate_per_minute,
+            "available": round(self.tokens, 2) if self.rate_per_minute > 0 else None,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3)
+        }
+
+class ProviderRateLimiter:
+    """
+    单个提供商的自适应限流
+
+    请求先占用并发名额，再等待Retry-After到期，最后从请求数和token数两个令牌桶取令牌。
+    并发上限按AIMD调整：每完成与当前上限相等数量的成功请求加一，直到配置的上限；
+    遇到限流或超时减半（同一冷却期内只减一次），最低为1
+    """
+
+    def __init__(self, provider: str, max_concurrency: int = 8,
+                 requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = ConcurrencyLimiter(self.max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+
+        self._blocked_until = 0.0
+        self._successes_since_increase = 0
+        self._last_decrease = 0.0
+
+        self.successes = 0
+        self.throttles = 0
+        self.timeouts = 0
+        self.increases = 0
+        self.decreases = 0
+
+    def configure(self, max_concurrency: int, requests_per_minute: float, tokens_per_minute: float):
+        """应用提供商配置；调低并发上限立即生效，调高后由AIMD逐步增加"""
+        self.max_concurrency = max(1, max_concurrency)
+        if self.concurrency.limit > self.max_concurrency:
+            self.concurrency.set_limit(self.max_concurrency)
+        self.request_bucket.configure(requests_per_minute)
+        self.token_bucket.configure(tokens_per_minute)
+
+    @asynccontextmanager
+    async def request(self, tokens: float = 1):
+        """
+        获取发送一次请求的许可
+
+        Args:
+            tokens: 请求预计消耗的token数
+        """
+        async with self.concurrency.slot():
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(tokens)
+            yield
+
+    def record_success(self):
+        """记录成功请求（加性增加并发上限）"""
+        self.successes += 1
+        self._successes_since_increase += 1
+        if self._successes_since_increase >= self.concurrency.limit and \
+                self.concurrency.limit < self.max_concurrency:
+            self.concurrency.set_limit(self.concurrency.limit + 1)
+            self._successes_since_increase = 0
+            self.increases += 1
+
+    def record_throttle(self, retry_after: Optional[float] = None, timeout: bool = False):
+        """
+        记录限流或超时（乘性减少并发上限）
+
+        Args:
+            retry_after: 提供商要求的等待秒数，期间该提供商的新请求都会等待
+            timeout: 是否为超时
+        """
+        now = time.monotonic()
+        if timeout:
+            self.timeouts += 1
+        else:
+            self.throttles += 1
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+        # 同一批并发请求可能同时被限流，冷却期内只减半一次
+        cooldown = max(1.0, retry_after or 0.0)
+        if now - self._last_decrease >= cooldown:
+            self.concurrency.set_limit(max(1, self.concurrency.limit // 2))
+            self._last_decrease = now
+            self._successes_since_increase = 0
+            self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """获取当前限制和限流统计"""
+        return {
+            "concurrency": dict(self.concurrency.stats(), max_limit=self.max_concurrency),
+            "requests": self.request_bucket.stats(),
+            "tokens": self.token_bucket.stats(),
+            "retry_after_remaining": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+            "successes": self.successes,
+            "throttles": self.throttles,
+            "timeouts": self.timeouts,
+            "increases": self.increases,
+            "decreases": self.decreases
+        }
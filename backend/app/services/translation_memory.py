@@ -0,0 +1,281 @@
+"""
+翻译记忆缓存
+以规范化原文、源语言、目标语言、提供商和模型为键，包含进程内LRU层和SQLite持久层
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config_manager import config_manager, CacheConfig
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# 每写入多少条执行一次过期和容量清理
+_PRUNE_INTERVAL = 200
+
+def normalize_text(text: str) -> str:
+    """规范化原文：Unicode NFKC归一、合并连续空白、去除首尾空白"""
+    return _WHITESPACE_PATTERN.sub(' ', unicodedata.normalize('NFKC', text)).strip()
+
+def memory_key(text: str, source_language: str, target_language: str, provider: str, model: str) -> str:
+    """生成翻译记忆键"""
+    payload = "\x1f".join([provider, model, source_language, target_language, normalize_text(text)])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class TranslationMemory:
+    """翻译记忆两级缓存"""
+
+    def __init__(self, db_path: str, memory_entries: int = 2048, max_entries: int = 100000,
+                 ttl_seconds: int = 30 * 24 * 3600, enabled: bool = True):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_prune = 0
+
+        # 按提供商统计命中情况
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        )
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> "TranslationMemory":
+        """根据缓存配置创建实例"""
+        return cls(
+            db_path=config.translation_db_path,
+            memory_entries=config.translation_memory_entries,
+            max_entries=config.translation_max_entries,
+            ttl_seconds=config.translation_ttl_hours * 3600,
+            enabled=config.translation_cache_enabled
+        )
+
+    def apply_config(self, config: CacheConfig):
+        """应用新的缓存配置"""
+        with self._lock:
+            self.enabled = config.translation_cache_enabled
+            self.memory_entries = config.translation_memory_entries
+            self.max_entries = config.translation_max_entries
+            self.ttl_seconds = config.translation_ttl_hours * 3600
+            if self.db_path != config.translation_db_path:
+                self.db_path = config.translation_db_path
+                self._memory.clear()
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+            self._trim_memory()
+
+    def _connection(self) -> sqlite3.Connection:
+        """打开SQLite连接（调用方需持有锁）"""
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translation_memory ("
+                "key TEXT PRIMARY KEY, provider TEXT, model TEXT, source_language TEXT, "
+                "target_language TEXT, source_text TEXT, translated_text TEXT, "
+                "created_at REAL, last_access REAL, hits INTEGER DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_translation_memory_last_access "
+                "ON translation_memory (last_access)"
+            )
+        return self._conn
+
+    def _trim_memory(self):
+        while len(self._memory) > max(0, self.memory_entries):
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: List[str], source_language: str, target_language: str,
+                 provider: str, model: str = "") -> Dict[int, str]:
+        """
+        批量查询翻译记忆
+
+        Args:
+            texts: 原文列表
+            source_language: 源语言
+            target_language: 目标语言
+            provider: 翻译服务提供商
+            model: 模型名称
+
+        Returns:
+            命中条目的{原文序号: 译文}
+        """
+        if not self.enabled or not texts:
+            return {}
+
+        now = time.time()
+        keys = [memory_key(text, source_language, target_language, provider, model) for text in texts]
+        found: Dict[int, str] = {}
+        missing: Dict[str, List[int]] = defaultdict(list)
+        stats = self._stats[provider]
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                entry = self._memory.get(key)
+                if entry is not None and now - entry[1] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    found[index] = entry[0]
+                    stats["memory_hits"] += 1
+                else:
+                    missing[key].append(index)
+
+            if missing:
+                try:
+                    conn = self._connection()
+                    placeholders = ",".join("?" * len(missing))
+                    rows = conn.execute(
+                        f"SELECT key, translated_text, created_at FROM translation_memory "
+                        f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                        [*missing.keys(), now - self.ttl_seconds]
+                    ).fetchall()
+                    if rows:
+                        conn.executemany(
+                            "UPDATE translation_memory SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                            [(now, key) for key, _, _ in rows]
+                        )
+                        conn.commit()
+                except Exception as e:
+                    logger.warning(f"读取翻译记忆失败: {e}")
+                    rows = []
+
+                for key, translated_text, created_at in rows:
+                    self._memory[key] = (translated_text, created_at)
+                    for index in missing.pop(key):
+                        found[index] = translated_text
+                        stats["disk_hits"] += 1
+                self._trim_memory()
+
+            stats["misses"] += sum(len(indices) for indices in missing.values())
+        return found
+
+    def put_many(self, pairs: List[Tuple[str, str]], source_language: str, target_language: str,
+                 provider: str, model: str = ""):
+        """
+        批量写入翻译记忆
+
+        Args:
+            pairs: (原文, 译文)列表，只应包含翻译服务成功返回的结果
+        """
+        if not self.enabled or not pairs:
+            return
+
+        now = time.time()
+        rows = [
+            (memory_key(text, source_language, target_language, provider, model), provider, model,
+             source_language, target_language, normalize_text(text), translated_text, now, now)
+            for text, translated_text in pairs
+        ]
+        with self._lock:
+            for row in rows:
+                self._memory[row[0]] = (row[6], now)
+                self._memory.move_to_end(row[0])
+            self._trim_memory()
+            self._stats[provider]["writes"] += len(rows)
+
+            try:
+                conn = self._connection()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translation_memory (key, provider, model, source_language, "
+                    "target_language, source_text, translated_text, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.commit()
+                self._writes_since_prune += len(rows)
+                if self._writes_since_prune >= _PRUNE_INTERVAL:
+                    self._prune(conn, now)
+            except Exception as e:
+                logger.warning(f"写入翻译记忆失败: {e}")
+
+    def get(self, text: str, source_language: str, target_language: str,
+            provider: str, model: str = "") -> Optional[str]:
+        """查询单条翻译记忆，未命中返回None"""
+        return self.get_many([text], source_language, target_language, provider, model).get(0)
+
+    def put(self, text: str, translated_text: str, source_language: str, target_language: str,
+            provider: str, model: str = ""):
+        """写入单条翻译记忆"""
+        self.put_many([(text, translated_text)], source_language, target_language, provider, model)
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """删除过期条目；超过容量上限时按最近访问时间淘汰到上限的90%"""
+        self._writes_since_prune = 0
+        expired = conn.execute(
+            "DELETE FROM translation_memory WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+        overflow = 0
+        if count > self.max_entries:
+            overflow = count - int(self.max_entries * 0.9)
+            conn.execute(
+                "DELETE FROM translation_memory WHERE key IN ("
+                "SELECT key FROM translation_memory ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+        conn.commit()
+        self.evictions += expired + overflow
+
+    def clear(self) -> int:
+        """清空翻译记忆，返回删除的持久层条目数"""
+        with self._lock:
+            self._memory.clear()
+            try:
+                conn = self._connection()
+                removed = conn.execute("DELETE FROM translation_memory").rowcount
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"清空翻译记忆失败: {e}")
+                removed = 0
+        logger.info(f"翻译记忆已清空，删除 {removed} 条记录")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """获取翻译记忆命中统计（按提供商）"""
+        with self._lock:
+            try:
+                disk_entries = self._connection().execute(
+                    "SELECT COUNT(*) FROM translation_memory"
+                ).fetchone()[0]
+            except Exception:
+                disk_entries = None
+
+            providers = {}
+            for provider, counts in self._stats.items():
+                lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+                providers[provider] = dict(
+                    counts,
+                    hit_rate=round((counts["memory_hits"] + counts["disk_hits"]) / lookups, 4) if lookups else 0.0
+                )
+
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.memory_entries,
+                "disk_entries": disk_entries,
+                "disk_capacity": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": self.evictions,
+                "providers": providers
+            }
+
+# 创建全局翻译记忆实例
+translation_memory = TranslationMemory.from_config(config_manager.get_cache_config())
@@ -1,16 +1,77 @@
-import openai
-import requests
+import json
 import logging
 import os
-from typing import List, Dict, Optional
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple, Union
 from enum import Enum
 import asyncio
-import aiohttp
 from dotenv import load_dotenv
 
+from ..core.config_manager import config_manager
+from ..utils.latency import LatencyWindow
+from ..utils.text_chunker import join_chunks, split_text
+from ..utils.token_budget import estimate_tokens
+from ..utils.untranslatable import is_untranslatable
+from .circuit_breaker import CircuitBreaker
+from .http_session_pool import http_session_pool
+from .provider_limiter import ProviderRateLimiter, RateLimitedError, parse_retry_after
+from .translation_memory import translation_memory, memory_key
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# OpenAI提示词中使用的语言名称
+OPENAI_LANGUAGE_NAMES = {
+    "en": "English",
+    "zh": "Chinese",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "fr": "French",
+    "de": "German",
+    "es": "Spanish",
+    "ru": "Russian"
+}
+
+# 百度翻译API的语言代码
+BAIDU_LANGUAGE_CODES = {
+    "auto": "auto",
+    "zh": "zh",
+    "en": "en",
+    "ja": "jp",
+    "ko": "kor",
+    "fr": "fra",
+    "de": "de",
+    "es": "spa",
+    "ru": "ru"
+}
+
+# 百度翻译单次请求q参数的字节数上限
+_BAIDU_MAX_QUERY_BYTES = 6000
+
+# Google翻译v2单次请求的文字条数上限和建议的总字符数
+_GOOGLE_MAX_SEGMENTS = 128
+_GOOGLE_MAX_QUERY_CHARS = 5000
+
+# 提示词和系统消息的估算token数
+_PROMPT_OVERHEAD_TOKENS = 60
+
+# 百度翻译的访问频率受限错误码
+_BAIDU_RATE_LIMIT_CODE = "54003"
+
+# 超时最多重试的次数，提供商卡住时尽快交给熔断和回退处理
+_MAX_TIMEOUT_RETRIES = 1
+
+# 对冲请求的最短等待时间（秒），避免样本耗时过短时几乎每个请求都被对冲
+_MIN_HEDGE_DELAY = 0.05
+
+# 打包请求的输出预算占max_tokens的比例，其余留给JSON结构和估算误差
+_PACKED_OUTPUT_RATIO = 0.8
+
+_CODE_FENCE_PATTERN = re.compile(r'^```[a-zA-Z]*\s*|\s*```$')
+
 class TranslationProvider(Enum):
     """翻译服务提供商"""
     OPENAI = "openai"
@@ -20,19 +81,195 @@ class TranslationProvider(Enum):
 class TranslationService:
     def __init__(self):
         """初始化翻译服务"""
-        self.openai_client = None
+        self._openai_client = None
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        self.openai_base_url = os.getenv("OPENAI_BASE_URL")
         self.baidu_api_key = os.getenv("BAIDU_API_KEY")
         self.baidu_secret_key = os.getenv("BAIDU_SECRET_KEY")
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         
-        # 初始化OpenAI客户端
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        openai_base_url = os.getenv("OPENAI_BASE_URL")
-        if openai_api_key:
-            if openai_base_url:
-                self.openai_client = openai.OpenAI(api_key=openai_api_key, base_url=openai_base_url)
+        # 各提供商的限流器
+        self._limiters: Dict[str, ProviderRateLimiter] = {}
+        
+        # 正在进行的翻译：翻译记忆键 -> 译文Future，相同请求共享同一次API调用
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._flight_tasks: set = set()
+        self._coalesce_stats = {"leaders": 0, "coalesced": 0}
+        
+        # 各提供商的熔断器
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        
+        # 请求耗时窗口（单条和批量请求分开统计）和对冲统计
+        self._latencies: Dict[str, LatencyWindow] = defaultdict(LatencyWindow)
+        self._hedge_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0}
+        )
+        
+        # 批量翻译统计（按提供商）
+        self._packed_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "items": 0, "parsed_items": 0, "fallback_items": 0, "failed_requests": 0}
+        )
+        
+        # 长文本分段统计（按提供商）
+        self._chunk_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"texts": 0, "chunks": 0})
+    
+    @property
+    def openai_client(self):
+        """OpenAI异步客户端（首次使用时创建，避免导入SDK拖慢应用启动）"""
+        if self._openai_client is None and self.openai_api_key:
+            import openai
+            if self.openai_base_url:
+                self._openai_client = openai.AsyncOpenAI(
+                    api_key=self.openai_api_key, base_url=self.openai_base_url, max_retries=0
+                )
             else:
-                self.openai_client = openai.OpenAI(api_key=openai_api_key)
+                self._openai_client = openai.AsyncOpenAI(api_key=self.openai_api_key, max_retries=0)
+        return self._openai_client
+    
+    async def close(self):
+        """关闭OpenAI客户端的连接池"""
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
+    
+    def _limiter(self, provider: TranslationProvider) -> ProviderRateLimiter:
+        """获取提供商的限流器，并同步TranslationConfig中的限制"""
+        config = config_manager.get_translation_config(provider.value)
+        max_concurrency = config.max_concurrency if config else 8
+        requests_per_minute = config.requests_per_minute if config else 0
+        tokens_per_minute = config.tokens_per_minute if config else 0
+        limiter = self._limiters.get(provider.value)
+        if limiter is None:
+            limiter = self._limiters[provider.value] = ProviderRateLimiter(
+                provider.value, max_concurrency, requests_per_minute, tokens_per_minute
+            )
+        else:
+            limiter.configure(max_concurrency, requests_per_minute, tokens_per_minute)
+        return limiter
+    
+    def _breaker(self, provider: TranslationProvider) -> CircuitBreaker:
+        """获取提供商的熔断器，并同步TranslationConfig中的熔断参数"""
+        breaker = self._breakers.get(provider.value)
+        if breaker is None:
+            breaker = self._breakers[provider.value] = CircuitBreaker(provider.value)
+        config = config_manager.get_translation_config(provider.value)
+        if config:
+            breaker.configure(config)
+        return breaker
+    
+    def _failover_provider(self, provider: TranslationProvider) -> Optional[TranslationProvider]:
+        """熔断时改用的提供商：第一个未熔断的其他已启用提供商"""
+        for name in config_manager.get_enabled_providers():
+            if name == provider.value:
+                continue
+            try:
+                candidate = TranslationProvider(name)
+            except ValueError:
+                continue
+            if self._breaker(candidate).available():
+                return candidate
+        return None
+    
+    def breaker_stats(self) -> Dict[str, Any]:
+        """获取各提供商的熔断状态和滑动窗口耗时直方图"""
+        return {provider.value: self._breaker(provider).stats() for provider in TranslationProvider}
+    
+    @staticmethod
+    def _throttle_signal(error: Exception) -> Optional[Tuple[bool, Optional[float]]]:
+        """
+        判断异常是否为限流或超时
+        
+        Returns:
+            (是否超时, Retry-After秒数)；其他异常返回None
+        """
+        if isinstance(error, RateLimitedError):
+            return False, error.retry_after
+        # Python 3.10及以下asyncio.TimeoutError（aiohttp的总超时）不是内置TimeoutError的子类
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+            return True, None
+        # OpenAI SDK只在使用过OpenAI时才会被导入
+        openai = sys.modules.get("openai")
+        if openai is not None:
+            if isinstance(error, openai.RateLimitError) and getattr(error, "code", None) != "insufficient_quota":
+                return False, parse_retry_after(error.response.headers.get("retry-after"))
+            if isinstance(error, openai.APITimeoutError):
+                return True, None
+        return None
+    
+    async def _call_with_rate_limit(self, provider: TranslationProvider, tokens: float,
+                                    call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        在提供商限流和熔断约束下发送请求
+        
+        被限流时按Retry-After（没有时指数退避）等待后重试，最多重试TranslationConfig.max_retries次；
+        超时最多只重试一次，避免卡住的提供商让单条请求耗时成倍增加。两者都会使并发上限减半。
+        提供商熔断中时直接抛出CircuitOpenError；限流不计入熔断错误率，超时和其他错误计入
+        
+        Args:
+            provider: 翻译服务提供商
+            tokens: 请求预计消耗的token数
+            call: 发送请求的无参协程函数
+        """
+        config = config_manager.get_translation_config(provider.value)
+        max_retries = config.max_retries if config else 3
+        limiter = self._limiter(provider)
+        breaker = self._breaker(provider)
+        attempt = 0
+        timeouts = 0
+        while True:
+            if not breaker.available():
+                # 熔断中不占用限流名额，直接拒绝
+                raise breaker.reject()
+            try:
+                async with limiter.request(tokens):
+                    probe = breaker.before_call()
+                    start = time.perf_counter()
+                    failed = None
+                    try:
+                        result = await call()
+                        failed = False
+                    except Exception as e:
+                        # 被限流说明提供商可用，不计入错误率；超时和其他错误计入
+                        signal = self._throttle_signal(e)
+                        failed = True if signal is None or signal[0] else None
+                        raise
+                    finally:
+                        breaker.after_call(time.perf_counter() - start, failed, probe)
+                limiter.record_success()
+                return result
+            except Exception as e:
+                signal = self._throttle_signal(e)
+                if signal is None:
+                    raise
+                is_timeout, retry_after = signal
+                if not is_timeout and retry_after is None:
+                    retry_after = min(30.0, 0.5 * 2 ** attempt)
+                limiter.record_throttle(retry_after, timeout=is_timeout)
+                if is_timeout:
+                    timeouts += 1
+                if attempt >= max_retries or timeouts > _MAX_TIMEOUT_RETRIES:
+                    raise
+                attempt += 1
+                logger.warning(
+                    f"{provider.value} {'请求超时' if is_timeout else '触发限流'}，"
+                    f"第{attempt}次重试（并发上限降为 {limiter.concurrency.limit}）"
+                )
+    
+    def _request_timeout(self, provider: TranslationProvider) -> int:
+        config = config_manager.get_translation_config(provider.value)
+        return config.timeout if config else 30
+    
+    def _api_url(self, provider: TranslationProvider, default: str) -> str:
+        """提供商的接口地址，优先使用TranslationConfig.api_url"""
+        config = config_manager.get_translation_config(provider.value)
+        return config.api_url if config and config.api_url else default
+    
+    def _model_name(self, provider: TranslationProvider) -> str:
+        """提供商使用的模型名称（参与翻译记忆键）"""
+        config = config_manager.get_translation_config(provider.value)
+        if provider == TranslationProvider.OPENAI:
+            return config.model if config and config.model else "gpt-3.5-turbo"
+        return config.model if config else ""
     
     async def translate_text(self, 
                            text: str, 
@@ -40,7 +277,9 @@ class TranslationService:
                            source_language: str = "auto",
                            provider: TranslationProvider = TranslationProvider.OPENAI) -> str:
         """
-        翻译文字
+        翻译文字，优先使用翻译记忆
+        
+        相同的(原文, 源语言, 目标语言, 提供商)正在翻译时直接等待同一结果，不重复调用API
         
         Args:
             text: 需要翻译的文字
@@ -52,95 +291,638 @@ class TranslationService:
             翻译后的文字
         """
         try:
-            if provider == TranslationProvider.OPENAI:
-                return await self._translate_with_openai(text, target_language, source_language)
-            elif provider == TranslationProvider.BAIDU:
-                return await self._translate_with_baidu(text, target_language, source_language)
-            elif provider == TranslationProvider.GOOGLE:
-                return await self._translate_with_google(text, target_language, source_language)
-            else:
-                raise ValueError(f"不支持的翻译提供商: {provider}")
+            model = self._model_name(provider)
+            cached = await asyncio.to_thread(
+                translation_memory.get, text, source_language, target_language, provider.value, model
+            )
+            if cached is not None:
+                return cached
+            
+            key = memory_key(text, source_language, target_language, provider.value, model)
+            flight = self._join_flight(key)
+            if flight is None:
+                flight = self._start_flights([text], [key], target_language, source_language, provider, model)[0]
+            return await asyncio.shield(flight)
                 
         except Exception as e:
             logger.error(f"翻译失败: {e}")
             # 返回原文作为fallback
             return text
     
+    async def stream_translate(self, text: str, target_language: str = "en", source_language: str = "auto",
+                               provider: TranslationProvider = TranslationProvider.OPENAI
+                               ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        流式翻译文字
+        
+        OpenAI使用流式接口，每收到一段译文产生一个chunk消息；其他提供商、翻译记忆命中、
+        相同文字正在翻译、文字过长需要分段或OpenAI熔断时，完整译文作为一个chunk消息返回。
+        完成后产生done消息，OpenAI流式结果在完成后写入翻译记忆
+        
+        Args:
+            text: 需要翻译的文字
+            target_language: 目标语言
+            source_language: 源语言
+            provider: 翻译服务提供商
+            
+        Yields:
+            {"event": "chunk", "data": {"text": 译文片段}} 或
+            {"event": "done", "data": {"translated_text": 完整译文, "cached": 是否命中翻译记忆, "streamed": 是否流式}}
+        """
+        model = self._model_name(provider)
+        cached = await asyncio.to_thread(
+            translation_memory.get, text, source_language, target_language, provider.value, model
+        )
+        key = memory_key(text, source_language, target_language, provider.value, model)
+        if cached is not None or provider != TranslationProvider.OPENAI or not self.openai_client or \
+                key in self._in_flight or not self._breaker(provider).available() or \
+                len(self._chunk_text(text, provider)) > 1:
+            translated_text = cached if cached is not None else await self.translate_text(
+                text, target_language, source_language, provider
+            )
+            yield {"event": "chunk", "data": {"text": translated_text}}
+            yield {"event": "done", "data": {
+                "translated_text": translated_text, "cached": cached is not None, "streamed": False
+            }}
+            return
+        
+        parts: List[str] = []
+        limiter = self._limiter(provider)
+        breaker = self._breaker(provider)
+        try:
+            async with limiter.request(estimate_tokens(text) * 2 + _PROMPT_OVERHEAD_TOKENS):
+                probe = breaker.before_call()
+                start = time.perf_counter()
+                failed = None
+                stream = None
+                try:
+                    stream = await self.openai_client.chat.completions.create(
+                        **self._openai_request(text, target_language), stream=True
+                    )
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+                            yield {"event": "chunk", "data": {"text": delta}}
+                    failed = False
+                except Exception as e:
+                    signal = self._throttle_signal(e)
+                    if signal is not None and not signal[0]:
+                        limiter.record_throttle(signal[1])
+                    failed = True if signal is None or signal[0] else None
+                    raise
+                finally:
+                    breaker.after_call(time.perf_counter() - start, failed, probe)
+                    if stream is not None and failed is not False:
+                        await stream.close()
+            limiter.record_success()
+        except Exception as e:
+            if parts:
+                raise
+            # 尚未输出任何译文时改用非流式翻译（含重试和熔断切换）
+            logger.warning(f"OpenAI流式翻译失败，改用普通翻译: {e}")
+            translated_text = await self.translate_text(text, target_language, source_language, provider)
+            yield {"event": "chunk", "data": {"text": translated_text}}
+            yield {"event": "done", "data": {"translated_text": translated_text, "cached": False, "streamed": False}}
+            return
+        
+        translated_text = "".join(parts).strip()
+        await asyncio.to_thread(
+            translation_memory.put, text, translated_text, source_language, target_language, provider.value, model
+        )
+        yield {"event": "done", "data": {"translated_text": translated_text, "cached": False, "streamed": True}}
+    
+    def _join_flight(self, key: str) -> Optional[asyncio.Future]:
+        """查找相同请求的进行中翻译"""
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self._coalesce_stats["coalesced"] += 1
+        return flight
+    
+    def _start_flights(self, texts: List[str], keys: List[str], target_language: str, source_language: str,
+                       provider: TranslationProvider, model: str) -> List[asyncio.Future]:
+        """
+        登记并在后台翻译一组文字，返回每条文字的译文Future
+        
+        翻译在独立任务中进行，发起方被取消时其他等待同一结果的调用方不受影响
+        """
+        loop = asyncio.get_running_loop()
+        flights = [loop.create_future() for _ in texts]
+        for key, flight in zip(keys, flights):
+            self._in_flight[key] = flight
+        self._coalesce_stats["leaders"] += len(keys)
+        
+        task = asyncio.ensure_future(
+            self._translate_flights(texts, keys, flights, target_language, source_language, provider, model)
+        )
+        self._flight_tasks.add(task)
+        task.add_done_callback(self._flight_tasks.discard)
+        return flights
+    
+    async def _translate_flights(self, texts: List[str], keys: List[str], flights: List[asyncio.Future],
+                                 target_language: str, source_language: str,
+                                 provider: TranslationProvider, model: str):
+        """
+        翻译一组文字，成功的译文写入翻译记忆后再完成对应的Future
+        
+        对冲或熔断切换由其他提供商返回的译文写入该提供商的翻译记忆，不记在所请求的提供商名下
+        """
+        translated_texts: List[Any] = []
+        try:
+            config = config_manager.get_translation_config(provider.value)
+            if config and config.packed and len(texts) > 1:
+                translated_texts = await self._translate_packed(texts, target_language, source_language, provider)
+            else:
+                # 并发翻译，请求速率和并发数由提供商限流器控制
+                translated_texts = await asyncio.gather(
+                    *[self._translate_with_provider(text, target_language, source_language, provider) for text in texts],
+                    return_exceptions=True
+                )
+            
+            new_pairs: Dict[TranslationProvider, List[Tuple[str, str]]] = {}
+            for text, result in zip(texts, translated_texts):
+                if isinstance(result, BaseException) or result[1] is None:
+                    continue
+                new_pairs.setdefault(result[1], []).append((text, result[0]))
+            for answered, pairs in new_pairs.items():
+                await asyncio.to_thread(
+                    translation_memory.put_many, pairs, source_language, target_language, answered.value,
+                    model if answered == provider else self._model_name(answered)
+                )
+        except Exception as e:
+            logger.error(f"翻译请求失败: {e}")
+        finally:
+            for index, (key, flight) in enumerate(zip(keys, flights)):
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                if flight.done():
+                    continue
+                result = translated_texts[index] if index < len(translated_texts) else None
+                if isinstance(result, tuple):
+                    flight.set_result(result[0])
+                else:
+                    flight.set_exception(
+                        result if isinstance(result, Exception) else RuntimeError("翻译请求未完成")
+                    )
+                    # 没有调用方等待时不记录未获取的异常
+                    flight.exception()
+    
+    def coalesce_stats(self) -> Dict[str, Any]:
+        """获取相同请求合并的统计"""
+        stats = dict(self._coalesce_stats, in_flight=len(self._in_flight))
+        total = stats["leaders"] + stats["coalesced"]
+        stats["coalesce_rate"] = round(stats["coalesced"] / total, 4) if total else 0.0
+        return stats
+    
+    def _hedge_target(self, provider: TranslationProvider, allow_failover: bool) -> TranslationProvider:
+        """对冲请求发往的提供商，由TranslationConfig.hedge_provider决定"""
+        config = config_manager.get_translation_config(provider.value)
+        name = config.hedge_provider if config and allow_failover else ""
+        enabled = config_manager.get_enabled_providers()
+        if name == "auto":
+            name = next((candidate for candidate in enabled if candidate != provider.value), "")
+        if name and name in enabled:
+            try:
+                target = TranslationProvider(name)
+            except ValueError:
+                return provider
+            if self._breaker(target).available():
+                return target
+        return provider
+    
+    async def _hedged(self, provider: TranslationProvider, kind: str,
+                      call: Callable[[TranslationProvider], Awaitable[Any]], allow_failover: bool = True) -> Any:
+        """
+        发送请求，超过历史耗时分位数仍未返回时再发一个对冲请求，采用先成功返回的结果
+        
+        Args:
+            provider: 翻译服务提供商
+            kind: 耗时统计的分类（单条或批量请求耗时差异较大，分开统计）
+            call: 以提供商为参数发送请求的协程函数
+            allow_failover: 是否允许对冲或熔断时改用其他提供商（批量请求的分组按提供商限制划分，不切换提供商）
+        
+        Returns:
+            (结果, 实际返回结果的提供商)
+        """
+        breaker = self._breaker(provider)
+        if allow_failover and not breaker.available():
+            fallback = self._failover_provider(provider)
+            if fallback is not None:
+                breaker.failovers += 1
+                provider = fallback
+        
+        config = config_manager.get_translation_config(provider.value)
+        window = self._latencies[f"{provider.value}:{kind}"]
+        stats = self._hedge_stats[provider.value]
+        stats["requests"] += 1
+        
+        delay = None
+        if config and config.hedge_percentile > 0 and len(window) >= config.hedge_min_samples:
+            delay = max(_MIN_HEDGE_DELAY, window.percentile(config.hedge_percentile))
+        
+        start = time.perf_counter()
+        primary = asyncio.ensure_future(call(provider))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if not done:
+                target = self._hedge_target(provider, allow_failover)
+                stats["hedged"] += 1
+                if target != provider:
+                    stats["failovers"] += 1
+                logger.info(f"{provider.value}请求超过 {delay * 1000:.0f}ms 未返回，向{target.value}发出对冲请求")
+                hedge = asyncio.ensure_future(call(target))
+                
+                pending = {primary, hedge}
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    winner = next((task for task in done if task.exception() is None), None)
+                    if winner is not None:
+                        break
+                if winner is hedge:
+                    stats["hedge_wins"] += 1
+                    # 主请求被取消，以取消时的耗时作为样本
+                    window.add(time.perf_counter() - start)
+                    return hedge.result(), target
+            
+            result = primary.result()
+            window.add(time.perf_counter() - start)
+            return result, provider
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+    
+    def hedge_stats(self) -> Dict[str, Any]:
+        """获取各提供商的对冲统计和耗时分位数"""
+        providers = {}
+        for provider, counts in self._hedge_stats.items():
+            providers[provider] = dict(
+                counts,
+                hedge_rate=round(counts["hedged"] / counts["requests"], 4) if counts["requests"] else 0.0,
+                win_rate=round(counts["hedge_wins"] / counts["hedged"], 4) if counts["hedged"] else 0.0,
+                latency={
+                    kind: self._latencies[f"{provider}:{kind}"].stats() for kind in ("single", "batch")
+                    if f"{provider}:{kind}" in self._latencies
+                }
+            )
+        return providers
+    
+    def _chunk_text(self, text: str, provider: TranslationProvider) -> List[str]:
+        """
+        按提供商配置的max_tokens将长文本切分为可单次请求翻译的片段
+        
+        译文的token数按原文估算值的两倍计算，每段译文预计不超过max_tokens的一定比例；
+        百度和Google还受单次请求的字节数、字符数限制
+        """
+        config = config_manager.get_translation_config(provider.value)
+        max_tokens = config.max_tokens if config else 4000
+        token_budget = max(1, int(max_tokens * _PACKED_OUTPUT_RATIO / 2))
+        if provider == TranslationProvider.BAIDU:
+            def size(chunk: str) -> float:
+                return max(estimate_tokens(chunk) / token_budget, len(chunk.encode('utf-8')) / _BAIDU_MAX_QUERY_BYTES)
+        elif provider == TranslationProvider.GOOGLE:
+            def size(chunk: str) -> float:
+                return max(estimate_tokens(chunk) / token_budget, len(chunk) / _GOOGLE_MAX_QUERY_CHARS)
+        else:
+            def size(chunk: str) -> float:
+                return estimate_tokens(chunk) / token_budget
+        return split_text(text, 1.0, size)
+    
+    async def _translate_with_provider(self, text: str, target_language: str, source_language: str,
+                                       provider: TranslationProvider) -> Tuple[str, Optional[TranslationProvider]]:
+        """
+        调用翻译服务提供商，慢请求会被对冲，失败时抛出异常；长文本分段并发翻译后按原顺序拼接
+        
+        Returns:
+            (译文, 返回译文的提供商)；分段译文来自不同提供商时提供商为None
+        """
+        chunks = self._chunk_text(text, provider)
+        if len(chunks) == 1:
+            return await self._hedged(
+                provider, "single", lambda target: self._call_provider(text, target_language, source_language, target)
+            )
+        
+        stats = self._chunk_stats[provider.value]
+        stats["texts"] += 1
+        stats["chunks"] += len(chunks)
+        logger.info(f"{provider.value}翻译的文字过长，分为 {len(chunks)} 段翻译")
+        responses = await asyncio.gather(*[
+            self._hedged(
+                provider, "single",
+                lambda target, chunk=chunk: self._call_provider(chunk, target_language, source_language, target)
+            )
+            for chunk in chunks
+        ])
+        answered = {target for _, target in responses}
+        return (join_chunks(chunks, [translation for translation, _ in responses]),
+                answered.pop() if len(answered) == 1 else None)
+    
+    def chunk_stats(self) -> Dict[str, Any]:
+        """获取各提供商的长文本分段统计"""
+        return {provider: dict(counts) for provider, counts in self._chunk_stats.items()}
+    
+    async def _call_provider(self, text: str, target_language: str, source_language: str,
+                             provider: TranslationProvider) -> str:
+        """调用翻译服务提供商（受提供商限流约束），失败时抛出异常"""
+        if provider == TranslationProvider.OPENAI:
+            call = self._translate_with_openai
+            tokens = estimate_tokens(text) * 2 + _PROMPT_OVERHEAD_TOKENS
+        elif provider == TranslationProvider.BAIDU:
+            call = self._translate_with_baidu
+            tokens = estimate_tokens(text)
+        elif provider == TranslationProvider.GOOGLE:
+            call = self._translate_with_google
+            tokens = estimate_tokens(text)
+        else:
+            raise ValueError(f"不支持的翻译提供商: {provider}")
+        return await self._call_with_rate_limit(
+            provider, tokens, lambda: call(text, target_language, source_language)
+        )
+    
+    def _openai_request(self, text: str, target_language: str) -> Dict[str, Any]:
+        """单条文字翻译的OpenAI请求参数"""
+        # 构建翻译提示
+        target_lang_name = OPENAI_LANGUAGE_NAMES.get(target_language, target_language)
+        
+        prompt = f"请将以下文字翻译成{target_lang_name}，只返回翻译结果，不要添加任何解释：\n\n{text}"
+        config = config_manager.get_translation_config(TranslationProvider.OPENAI.value)
+        
+        return {
+            "model": self._model_name(TranslationProvider.OPENAI),
+            "messages": [
+                {"role": "system", "content": "你是一个专业的翻译助手，能够准确翻译各种语言。"},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": config.max_tokens if config else 4000,
+            "temperature": 0.3,
+            "timeout": self._request_timeout(TranslationProvider.OPENAI)
+        }
+    
     async def _translate_with_openai(self, text: str, target_language: str, source_language: str) -> str:
         """使用OpenAI进行翻译"""
         if not self.openai_client:
             raise ValueError("OpenAI API密钥未配置")
         
         try:
-            # 构建翻译提示
-            language_map = {
-                "en": "English",
-                "zh": "Chinese",
-                "ja": "Japanese",
-                "ko": "Korean",
-                "fr": "French",
-                "de": "German",
-                "es": "Spanish",
-                "ru": "Russian"
-            }
+            response = await self.openai_client.chat.completions.create(**self._openai_request(text, target_language))
             
-            target_lang_name = language_map.get(target_language, target_language)
+            translated_text = response.choices[0].message.content.strip()
+            return translated_text
             
-            prompt = f"请将以下文字翻译成{target_lang_name}，只返回翻译结果，不要添加任何解释：\n\n{text}"
+        except RateLimitedError:
+            raise
+        except Exception as e:
+            logger.error(f"OpenAI翻译失败: {e}")
+            raise e
+    
+    @staticmethod
+    def _group_items(texts: List[str], max_size: float, size: Callable[[str], float],
+                     max_items: Optional[int] = None,
+                     standalone: Optional[Callable[[str], bool]] = None) -> List[List[int]]:
+        """
+        按顺序将文字分组，每组的总大小不超过max_size、条数不超过max_items
+        
+        Args:
+            texts: 文字列表
+            max_size: 每组的大小上限（单条超过上限时单独成组）
+            size: 计算单条文字大小的函数
+            max_items: 每组的条数上限
+            standalone: 返回True的文字单独成组
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
+        Returns:
+            每组文字在texts中的序号列表
+        """
+        groups: List[List[int]] = []
+        current: List[int] = []
+        used = 0.0
+        for index, text in enumerate(texts):
+            if standalone is not None and standalone(text):
+                groups.append([index])
+                continue
+            cost = size(text)
+            if current and (used + cost > max_size or (max_items and len(current) >= max_items)):
+                groups.append(current)
+                current, used = [], 0.0
+            current.append(index)
+            used += cost
+        if current:
+            groups.append(current)
+        return groups
+    
+    @classmethod
+    def _pack_items(cls, texts: List[str], provider: TranslationProvider, max_tokens: int) -> List[List[int]]:
+        """按提供商的单次请求限制将文字分组"""
+        if provider == TranslationProvider.BAIDU:
+            # 换行分隔多条文字，含换行或空白的文字无法按行对应，单独请求
+            return cls._group_items(
+                texts, _BAIDU_MAX_QUERY_BYTES, lambda text: len(text.encode('utf-8')) + 1,
+                standalone=lambda text: "\n" in text or not text.strip()
+            )
+        if provider == TranslationProvider.GOOGLE:
+            return cls._group_items(texts, _GOOGLE_MAX_QUERY_CHARS, len, max_items=_GOOGLE_MAX_SEGMENTS)
+        # 译文可能比原文长，另计id和JSON结构的开销；每组的译文预计不超过max_tokens的一定比例
+        return cls._group_items(
+            texts, max(1, int(max_tokens * _PACKED_OUTPUT_RATIO)), lambda text: estimate_tokens(text) * 2 + 10
+        )
+    
+    @staticmethod
+    def _parse_packed_response(content: str, ids: List[int]) -> Dict[int, str]:
+        """
+        解析打包翻译的返回内容
+        
+        接受{"translations": [{"id": n, "text": "..."}]}或直接返回的数组；
+        id不在请求中、重复出现或译文为空的条目都会被丢弃
+        
+        Returns:
+            {id: 译文}
+        """
+        content = _CODE_FENCE_PATTERN.sub('', content.strip())
+        start = min((i for i in (content.find('{'), content.find('[')) if i >= 0), default=-1)
+        if start < 0:
+            raise ValueError("返回内容中没有JSON")
+        data, _ = json.JSONDecoder().raw_decode(content[start:])
+        items = data.get("translations") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise ValueError("返回内容缺少translations数组")
+        
+        expected = set(ids)
+        parsed: Dict[int, str] = {}
+        duplicated = set()
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_id, text = item.get("id"), item.get("text")
+            if isinstance(item_id, str) and item_id.isdigit():
+                item_id = int(item_id)
+            if item_id not in expected or not isinstance(text, str) or not text.strip():
+                continue
+            if item_id in parsed:
+                duplicated.add(item_id)
+            parsed[item_id] = text.strip()
+        for item_id in duplicated:
+            del parsed[item_id]
+        return parsed
+    
+    async def _translate_batch_with_openai(self, texts: List[str], target_language: str,
+                                           source_language: str) -> Dict[int, str]:
+        """用一次OpenAI请求翻译一组文字，返回{组内序号: 译文}"""
+        config = config_manager.get_translation_config(TranslationProvider.OPENAI.value)
+        target_lang_name = OPENAI_LANGUAGE_NAMES.get(target_language, target_language)
+        payload = json.dumps([{"id": i, "text": text} for i, text in enumerate(texts)], ensure_ascii=False)
+        prompt = (
+            f"请将下面JSON数组中每一项的text翻译成{target_lang_name}。"
+            f"只返回JSON对象{{\"translations\": [{{\"id\": 序号, \"text\": \"译文\"}}]}}，"
+            f"每一项保持原有id，不要合并、拆分或遗漏条目，不要添加任何解释：\n\n{payload}"
+        )
+        
+        response = await self._call_with_rate_limit(
+            TranslationProvider.OPENAI,
+            estimate_tokens(payload) * 2 + _PROMPT_OVERHEAD_TOKENS,
+            lambda: self.openai_client.chat.completions.create(
+                model=self._model_name(TranslationProvider.OPENAI),
                 messages=[
                     {"role": "system", "content": "你是一个专业的翻译助手，能够准确翻译各种语言。"},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=500,
-                temperature=0.3
+                max_tokens=config.max_tokens if config else 4000,
+                temperature=0.3,
+                timeout=self._request_timeout(TranslationProvider.OPENAI)
             )
+        )
+        return self._parse_packed_response(response.choices[0].message.content or "", list(range(len(texts))))
+    
+    async def _translate_packed(self, texts: List[str], target_language: str, source_language: str,
+                                provider: TranslationProvider
+                                ) -> List[Union[Tuple[str, Optional[TranslationProvider]], Exception]]:
+        """
+        将多条文字合并为少量请求并发翻译
+        
+        OpenAI打包为编号JSON数组，百度以换行分隔，Google使用多个q参数；
+        每个请求的大小受提供商限制（OpenAI按max_tokens）。需要分段的长文本不参与打包，单独分段翻译；
+        返回结果缺失或无法对应的条目逐条回退到普通翻译
+        
+        Returns:
+            与texts对应的(译文, 返回译文的提供商)列表，翻译失败的位置为异常对象
+        """
+        config = config_manager.get_translation_config(provider.value)
+        chunked = [i for i, text in enumerate(texts) if len(self._chunk_text(text, provider)) > 1]
+        packable = [i for i in range(len(texts)) if i not in set(chunked)]
+        groups = [
+            [packable[position] for position in group]
+            for group in self._pack_items([texts[i] for i in packable], provider, config.max_tokens if config else 4000)
+        ]
+        if provider == TranslationProvider.OPENAI:
+            if not self.openai_client:
+                raise ValueError("OpenAI API密钥未配置")
             
-            translated_text = response.choices[0].message.content.strip()
-            return translated_text
+            def send(group_texts: List[str]) -> Callable[[TranslationProvider], Awaitable[Dict[int, str]]]:
+                # OpenAI的分组请求自行计入限流
+                return lambda _: self._translate_batch_with_openai(group_texts, target_language, source_language)
+        else:
+            batch_call = (self._translate_batch_with_baidu if provider == TranslationProvider.BAIDU
+                          else self._translate_batch_with_google)
             
-        except Exception as e:
-            logger.error(f"OpenAI翻译失败: {e}")
-            raise e
+            def send(group_texts: List[str]) -> Callable[[TranslationProvider], Awaitable[Dict[int, str]]]:
+                # 批量请求自行计入限流和熔断，结果行数不符不计为提供商失败
+                return lambda _: batch_call(group_texts, target_language, source_language)
+        
+        requests = [
+            self._hedged(provider, "batch", send([texts[i] for i in group]), allow_failover=False)
+            for group in groups
+        ]
+        chunked_requests = [
+            self._translate_with_provider(texts[i], target_language, source_language, provider) for i in chunked
+        ]
+        responses = await asyncio.gather(*requests, *chunked_requests, return_exceptions=True)
+        
+        stats = self._packed_stats[provider.value]
+        results: List[Union[Tuple[str, Optional[TranslationProvider]], Exception, None]] = [None] * len(texts)
+        for index, result in zip(chunked, responses[len(groups):]):
+            results[index] = result
+        for group, response in zip(groups, responses[:len(groups)]):
+            stats["requests"] += 1
+            stats["items"] += len(group)
+            if isinstance(response, Exception):
+                logger.warning(f"{provider.value}批量翻译失败，{len(group)}条文字逐条翻译: {response}")
+                stats["failed_requests"] += 1
+                continue
+            response, answered = response
+            for position, index in enumerate(group):
+                if position in response:
+                    results[index] = (response[position], answered)
+            stats["parsed_items"] += len(response)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            stats["fallback_items"] += len(missing)
+            fallbacks = await asyncio.gather(
+                *[self._translate_with_provider(texts[i], target_language, source_language, provider)
+                  for i in missing],
+                return_exceptions=True
+            )
+            for index, result in zip(missing, fallbacks):
+                results[index] = result
+        return results
+    
+    def packed_stats(self) -> Dict[str, Any]:
+        """获取各提供商的批量翻译统计"""
+        providers = {}
+        for provider, counts in self._packed_stats.items():
+            providers[provider] = dict(
+                counts,
+                fallback_rate=round(counts["fallback_items"] / counts["items"], 4) if counts["items"] else 0.0
+            )
+        return providers
+    
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        """获取各提供商当前的并发、请求数和token数限制及限流统计"""
+        return {provider: limiter.stats() for provider, limiter in self._limiters.items()}
     
     async def _translate_with_baidu(self, text: str, target_language: str, source_language: str) -> str:
-        """使用百度翻译API进行翻译"""
+        """使用百度翻译API进行翻译（多行文字逐行翻译后按原行拼接）"""
+        return "\n".join(await self._request_baidu(text, target_language, source_language))
+    
+    async def _translate_batch_with_baidu(self, texts: List[str], target_language: str,
+                                          source_language: str) -> Dict[int, str]:
+        """
+        用一次百度翻译请求翻译多条单行文字（以换行分隔），按行序号对应结果
+        
+        限流和熔断只作用于请求本身，返回行数与请求不符时抛出的ValueError不计入熔断错误率
+        """
+        query = "\n".join(texts)
+        lines = await self._call_with_rate_limit(
+            TranslationProvider.BAIDU, estimate_tokens(query),
+            lambda: self._request_baidu(query, target_language, source_language)
+        )
+        if len(texts) == 1:
+            return {0: "\n".join(lines)}
+        if len(lines) != len(texts):
+            raise ValueError(f"百度翻译返回 {len(lines)} 行结果，请求为 {len(texts)} 行")
+        return dict(enumerate(lines))
+    
+    async def _request_baidu(self, query: str, target_language: str, source_language: str) -> List[str]:
+        """发送百度翻译请求，返回每行的译文"""
         if not self.baidu_api_key or not self.baidu_secret_key:
             raise ValueError("百度翻译API密钥未配置")
         
         try:
             import hashlib
             import random
-            import time
             
             # 百度翻译API参数
-            url = "https://fanyi-api.baidu.com/api/trans/vip/translate"
-            
-            # 语言代码映射
-            lang_map = {
-                "auto": "auto",
-                "zh": "zh",
-                "en": "en",
-                "ja": "jp",
-                "ko": "kor",
-                "fr": "fra",
-                "de": "de",
-                "es": "spa",
-                "ru": "ru"
-            }
+            url = self._api_url(TranslationProvider.BAIDU, "https://fanyi-api.baidu.com/api/trans/vip/translate")
             
-            from_lang = lang_map.get(source_language, "auto")
-            to_lang = lang_map.get(target_language, "en")
+            from_lang = BAIDU_LANGUAGE_CODES.get(source_language, "auto")
+            to_lang = BAIDU_LANGUAGE_CODES.get(target_language, "en")
             
             # 生成签名
             salt = str(random.randint(32768, 65536))
-            sign_str = self.baidu_api_key + text + salt + self.baidu_secret_key
+            sign_str = self.baidu_api_key + query + salt + self.baidu_secret_key
             sign = hashlib.md5(sign_str.encode('utf-8')).hexdigest()
             
             params = {
-                'q': text,
+                'q': query,
                 'from': from_lang,
                 'to': to_lang,
                 'appid': self.baidu_api_key,
@@ -148,46 +930,69 @@ class TranslationService:
                 'sign': sign
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=params) as response:
-                    result = await response.json()
-                    
-                    if 'trans_result' in result:
-                        return result['trans_result'][0]['dst']
-                    else:
-                        raise ValueError(f"百度翻译API返回错误: {result}")
+            session = http_session_pool.get_session(TranslationProvider.BAIDU.value)
+            async with session.post(url, data=params) as response:
+                result = await response.json()
+            
+            if str(result.get('error_code')) == _BAIDU_RATE_LIMIT_CODE:
+                raise RateLimitedError(f"百度翻译访问频率受限: {result.get('error_msg')}")
+            if 'trans_result' in result:
+                return [item['dst'] for item in result['trans_result']]
+            else:
+                raise ValueError(f"百度翻译API返回错误: {result}")
                         
+        except RateLimitedError:
+            raise
         except Exception as e:
             logger.error(f"百度翻译失败: {e}")
             raise e
     
     async def _translate_with_google(self, text: str, target_language: str, source_language: str) -> str:
         """使用Google翻译API进行翻译"""
+        return (await self._request_google([text], target_language, source_language))[0]
+    
+    async def _translate_batch_with_google(self, texts: List[str], target_language: str,
+                                           source_language: str) -> Dict[int, str]:
+        """用一次Google翻译请求翻译多条文字（重复的q参数），按序号对应结果（受提供商限流和熔断约束）"""
+        translations = await self._call_with_rate_limit(
+            TranslationProvider.GOOGLE, sum(estimate_tokens(text) for text in texts),
+            lambda: self._request_google(texts, target_language, source_language)
+        )
+        return dict(enumerate(translations))
+    
+    async def _request_google(self, texts: List[str], target_language: str, source_language: str) -> List[str]:
+        """发送Google翻译请求，返回与texts对应的译文"""
         if not self.google_api_key:
             raise ValueError("Google翻译API密钥未配置")
         
         try:
-            url = "https://translation.googleapis.com/language/translate/v2"
+            url = self._api_url(TranslationProvider.GOOGLE, "https://translation.googleapis.com/language/translate/v2")
             
-            params = {
-                'key': self.google_api_key,
-                'q': text,
-                'target': target_language,
-                'format': 'text'
-            }
+            # 每条文字一个q参数
+            params = [('key', self.google_api_key), ('target', target_language), ('format', 'text')]
+            params.extend(('q', text) for text in texts)
             
             if source_language != "auto":
-                params['source'] = source_language
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=params) as response:
-                    result = await response.json()
-                    
-                    if 'data' in result and 'translations' in result['data']:
-                        return result['data']['translations'][0]['translatedText']
-                    else:
-                        raise ValueError(f"Google翻译API返回错误: {result}")
+                params.append(('source', source_language))
+            
+            session = http_session_pool.get_session(TranslationProvider.GOOGLE.value)
+            async with session.post(url, data=params) as response:
+                if response.status == 429:
+                    raise RateLimitedError(
+                        "Google翻译请求过于频繁", parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                result = await response.json()
+            
+            if 'data' in result and 'translations' in result['data']:
+                translations = [item['translatedText'] for item in result['data']['translations']]
+                if len(translations) != len(texts):
+                    raise ValueError(f"Google翻译返回 {len(translations)} 条结果，请求为 {len(texts)} 条")
+                return translations
+            else:
+                raise ValueError(f"Google翻译API返回错误: {result}")
                         
+        except RateLimitedError:
+            raise
         except Exception as e:
             logger.error(f"Google翻译失败: {e}")
             raise e
@@ -209,29 +1014,92 @@ class TranslationService:
         Returns:
             翻译后的文字列表
         """
+        results, _ = await self.batch_translate_with_stats(texts, target_language, source_language, provider)
+        return results
+    
+    async def batch_translate_with_stats(self,
+                                         texts: List[str],
+                                         target_language: str = "en",
+                                         source_language: str = "auto",
+                                         provider: TranslationProvider = TranslationProvider.OPENAI
+                                         ) -> Tuple[List[str], Dict[str, int]]:
+        """
+        批量翻译文字，并统计本次请求节省的翻译调用
+        
+        相同的文字只翻译一次，无需翻译的文字（数字、价格、网址等）原样保留；
+        其余文字先批量查询翻译记忆，只有未命中的文字才会请求翻译服务，成功的译文写回翻译记忆。
+        与其他请求中正在翻译的文字（或本批中规范化后相同的文字）合并为同一次调用。
+        启用打包时，未命中的多条文字按提供商的批量接口合并为少量请求
+        
+        Args:
+            texts: 需要翻译的文字列表
+            target_language: 目标语言
+            source_language: 源语言
+            provider: 翻译服务提供商
+            
+        Returns:
+            (与texts对应的译文列表, 统计)；统计包含total、duplicates、untranslatable、
+            memory_hits、coalesced、requested（实际请求翻译的文字数）和saved_calls
+        """
+        stats = {"total": len(texts), "duplicates": 0, "untranslatable": 0,
+                 "memory_hits": 0, "coalesced": 0, "requested": 0, "saved_calls": 0}
         try:
-            # 并发翻译
-            tasks = [
-                self.translate_text(text, target_language, source_language, provider)
-                for text in texts
-            ]
+            unique_texts = list(dict.fromkeys(texts))
+            stats["duplicates"] = len(texts) - len(unique_texts)
+            translations = {text: text for text in unique_texts if is_untranslatable(text)}
+            stats["untranslatable"] = len(translations)
+            candidates = [text for text in unique_texts if text not in translations]
             
-            translated_texts = await asyncio.gather(*tasks, return_exceptions=True)
+            model = self._model_name(provider)
+            cached = await asyncio.to_thread(
+                translation_memory.get_many, candidates, source_language, target_language, provider.value, model
+            )
+            stats["memory_hits"] = len(cached)
+            for i, translated_text in cached.items():
+                translations[candidates[i]] = translated_text
+            pending = [text for i, text in enumerate(candidates) if i not in cached]
             
-            # 处理异常结果
-            results = []
-            for i, result in enumerate(translated_texts):
-                if isinstance(result, Exception):
-                    logger.error(f"翻译第{i}个文本失败: {result}")
-                    results.append(texts[i])  # 使用原文
+            # 已在翻译中的文字等待已有结果，其余文字登记后一起翻译
+            keys = {text: memory_key(text, source_language, target_language, provider.value, model) for text in pending}
+            flights: Dict[str, asyncio.Future] = {}
+            own_keys: Dict[str, str] = {}
+            for text in pending:
+                key = keys[text]
+                if key in flights or key in own_keys:
+                    self._coalesce_stats["coalesced"] += 1
+                    stats["coalesced"] += 1
+                    continue
+                flight = self._join_flight(key)
+                if flight is not None:
+                    flights[key] = flight
+                    stats["coalesced"] += 1
                 else:
-                    results.append(result)
+                    own_keys[key] = text
+            if own_keys:
+                started = self._start_flights(
+                    list(own_keys.values()), list(own_keys.keys()),
+                    target_language, source_language, provider, model
+                )
+                flights.update(zip(own_keys.keys(), started))
+            stats["requested"] = len(own_keys)
+            stats["saved_calls"] = len(texts) - len(own_keys)
+            
+            translated_texts = await asyncio.gather(
+                *[asyncio.shield(flights[keys[text]]) for text in pending], return_exceptions=True
+            )
             
-            return results
+            # 处理异常结果
+            for text, result in zip(pending, translated_texts):
+                if isinstance(result, BaseException):
+                    logger.error(f"翻译文本失败: {result}")  # 使用原文
+                    translations[text] = text
+                else:
+                    translations[text] = result
+            return [translations[text] for text in texts], stats
             
         except Exception as e:
             logger.error(f"批量翻译失败: {e}")
-            return texts  # 返回原文列表
+            return texts, stats  # 返回原文列表
     
     def detect_language(self, text: str) -> str:
         """
@@ -1,5 +1,7 @@
 import os
 import mimetypes
+import cv2
+import numpy as np
 from PIL import Image
 from typing import Dict, Any
 
@@ -30,6 +32,15 @@ def get_image_info(file_path: str) -> Dict[str, Any]:
     except Exception as e:
         raise ValueError(f"无法读取图像信息: {str(e)}")
 
+def decode_image_bytes(content: bytes) -> np.ndarray:
+    """
+    将上传的图片字节直接解码为BGR数组，不经过临时文件
+    """
+    image = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("无法解码图片数据")
+    return image
+
 def get_file_mimetype(file_path: str) -> str:
     """
     获取文件MIME类型
@@ -0,0 +1,109 @@
+"""
+图片感知哈希工具
+计算pHash/dHash，并用BK树按汉明距离查找相似图片
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """BGR/BGRA图片转为灰度，灰度图原样返回"""
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+def phash(image: np.ndarray) -> int:
+    """
+    计算64位感知哈希（DCT低频系数与中位数比较）
+
+    Args:
+        image: BGR或灰度图片数组
+    """
+    small = cv2.resize(to_gray(image), (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low_freq = cv2.dct(small)[:8, :8]
+    # 直流分量不参与中位数计算，避免整体亮度主导结果
+    median = np.median(low_freq.flatten()[1:])
+    return _bits_to_int(low_freq > median)
+
+def dhash(image: np.ndarray) -> int:
+    """
+    计算64位差异哈希（相邻像素亮度梯度）
+
+    Args:
+        image: BGR或灰度图片数组
+    """
+    small = cv2.resize(to_gray(image), (9, 8), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+def hash_to_hex(value: int) -> str:
+    """哈希值转为16位十六进制字符串（用于数据库存储）"""
+    return f"{value:016x}"
+
+def hash_from_hex(value: str) -> int:
+    """十六进制字符串还原为哈希值"""
+    return int(value, 16)
+
+def image_hashes(image: np.ndarray) -> Dict[str, str]:
+    """计算图片的pHash和dHash，返回十六进制字符串"""
+    return {"phash": hash_to_hex(phash(image)), "dhash": hash_to_hex(dhash(image))}
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个哈希值的汉明距离"""
+    return bin(a ^ b).count("1")
+
+class BKTree:
+    """
+    按汉明距离组织的BK树
+
+    查询时利用三角不等式剪枝，只访问与目标距离可能不超过阈值的子树
+    """
+
+    def __init__(self):
+        self._root: Optional[Tuple[int, Any, Dict[int, Any]]] = None
+        self.size = 0
+
+    def add(self, hash_value: int, item: Any):
+        """插入哈希值及其关联数据"""
+        self.size += 1
+        if self._root is None:
+            self._root = (hash_value, item, {})
+            return
+        node = self._root
+        while True:
+            distance = hamming_distance(hash_value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (hash_value, item, {})
+                return
+            node = child
+
+    def search(self, hash_value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        查找距离不超过max_distance的所有条目
+
+        Returns:
+            (距离, 关联数据)列表，按距离升序
+        """
+        if self._root is None:
+            return []
+        matches = []
+        stack = [self._root]
+        while stack:
+            node_hash, item, children = stack.pop()
+            distance = hamming_distance(hash_value, node_hash)
+            if distance <= max_distance:
+                matches.append((distance, item))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        matches.sort(key=lambda match: match[0])
+        return matches
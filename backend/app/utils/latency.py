@@ -0,0 +1,52 @@
+"""
+请求耗时统计
+保留最近若干次请求的耗时，用于计算分位数
+"""
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+class LatencyWindow:
+    """最近N次请求耗时的滑动窗口"""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        """记录一次耗时（秒）"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        计算耗时分位数（最近邻法）
+
+        Args:
+            percent: 百分位，0~100
+
+        Returns:
+            分位数（秒），没有样本时返回None
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(percent / 100 * len(samples)))
+        return samples[min(rank, len(samples)) - 1]
+
+    def stats(self) -> Dict[str, Any]:
+        """获取常用分位数（毫秒）"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "samples": len(self._samples),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99))
+        }
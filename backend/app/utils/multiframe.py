@@ -0,0 +1,116 @@
+"""
+多帧图片（GIF、WebP动图、多页TIFF）读写工具
+逐帧解码输入，处理后的帧追加到磁盘上的临时多页TIFF，编码输出时再逐帧读取。
+GIF和TIFF逐帧编码，内存中只保留少量帧；WebP动图由libwebp的动画编码器在内存中组装，
+帧数受ImageProcessingConfig.max_frames限制
+"""
+import io
+import os
+import tempfile
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import GifImagePlugin, Image, ImageSequence, TiffImagePlugin
+
+# 支持多帧输出的格式及对应扩展名
+MULTIFRAME_FORMATS = {"GIF": ".gif", "WEBP": ".webp", "TIFF": ".tiff"}
+
+DEFAULT_FRAME_DURATION = 100  # 毫秒
+
+def open_multiframe(content: bytes) -> Optional[Image.Image]:
+    """
+    打开多帧图片
+
+    Args:
+        content: 图片文件字节
+
+    Returns:
+        帧数大于1且格式支持多帧输出时返回PIL图片对象（调用方负责关闭），否则返回None
+    """
+    try:
+        image = Image.open(io.BytesIO(content))
+    except Exception:
+        return None
+    if image.format in MULTIFRAME_FORMATS and getattr(image, "n_frames", 1) > 1:
+        return image
+    image.close()
+    return None
+
+def iter_frames(image: Image.Image) -> Iterator[Tuple[int, np.ndarray, int]]:
+    """
+    逐帧解码
+
+    Yields:
+        (帧序号, BGR帧数组, 帧时长毫秒)
+    """
+    default_duration = image.info.get("duration", DEFAULT_FRAME_DURATION)
+    for index, frame in enumerate(ImageSequence.Iterator(image)):
+        # 部分格式在帧数据加载后才更新帧时长
+        rgb = np.asarray(frame.convert("RGB"))
+        duration = frame.info.get("duration", default_duration) or DEFAULT_FRAME_DURATION
+        yield index, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), int(duration)
+
+class FrameSpool:
+    """按顺序暂存处理后的帧"""
+
+    def __init__(self, spool_dir: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(suffix=".tiff", dir=spool_dir)
+        os.close(fd)
+        self._writer = TiffImagePlugin.AppendingTiffWriter(self.path, new=True)
+        self.durations: List[int] = []
+
+    def append(self, frame: np.ndarray, duration: int):
+        """追加一帧BGR图片"""
+        Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).save(self._writer, format="TIFF")
+        self._writer.newFrame()
+        self.durations.append(duration)
+
+    def write(self, output_path: str, image_format: str, loop: int = 0):
+        """
+        将暂存的帧编码为多帧图片
+
+        Args:
+            output_path: 输出路径
+            image_format: 输出格式（GIF、WEBP、TIFF）
+            loop: 动图循环次数，0表示无限循环
+        """
+        self._writer.close()
+        if image_format == "GIF":
+            self._write_gif(output_path, loop)
+            return
+        options = {"save_all": True}
+        if image_format == "TIFF":
+            options["compression"] = "tiff_deflate"
+        else:
+            options.update(duration=self.durations, loop=loop)
+        with Image.open(self.path) as spooled:
+            spooled.save(output_path, format=image_format, **options)
+
+    def _write_gif(self, output_path: str, loop: int):
+        """
+        逐帧编码GIF
+
+        Pillow的save_all会先把全部帧收集到内存中再编码，这里每读出一帧就量化为独立调色板
+        写入文件，内存占用与帧数无关
+        """
+        with Image.open(self.path) as spooled, open(output_path, 'wb') as fp:
+            for index, frame in enumerate(ImageSequence.Iterator(spooled)):
+                paletted = frame.convert("RGB").quantize(colors=256)
+                if index == 0:
+                    header, _ = GifImagePlugin.getheader(paletted, info={"loop": loop, "optimize": False})
+                    for chunk in header:
+                        fp.write(chunk)
+                for chunk in GifImagePlugin.getdata(paletted, include_color_table=True,
+                                                    duration=self.durations[index]):
+                    fp.write(chunk)
+            fp.write(b";")  # GIF结束标记
+
+    def close(self):
+        """删除暂存文件"""
+        try:
+            self._writer.close()
+        except Exception:
+            pass
+        if os.path.exists(self.path):
+            os.remove(self.path)
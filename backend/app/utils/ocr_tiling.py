@@ -0,0 +1,169 @@
+"""
+大图分块OCR工具
+将超大图片切分为带重叠区域的图块，并合并各图块的识别结果
+"""
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+def should_tile(height: int, width: int, tile_size: int, pixel_threshold: int) -> bool:
+    """
+    判断图片是否需要分块识别
+
+    Args:
+        height: 图片高度
+        width: 图片宽度
+        tile_size: 图块边长
+        pixel_threshold: 触发分块的像素数阈值
+    """
+    long_side, short_side = max(height, width), max(1, min(height, width))
+    if long_side <= tile_size:
+        return False
+    if height * width > pixel_threshold:
+        return True
+    # 长截图等细长图片整体缩放后文字损失最严重，像素数未超阈值也分块
+    return long_side / short_side >= 4 and long_side > 2 * tile_size
+
+def compute_tiles(height: int, width: int, tile_size: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """
+    计算带重叠区域的图块位置
+
+    Args:
+        height: 图片高度
+        width: 图片宽度
+        tile_size: 图块边长
+        overlap: 相邻图块的重叠像素数
+
+    Returns:
+        图块列表，每个元素为(x, y, w, h)
+    """
+    overlap = max(0, min(overlap, tile_size // 2))
+    stride = tile_size - overlap
+
+    def _starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        starts = list(range(0, length - tile_size, stride))
+        # 最后一块贴齐边缘，保证尺寸完整
+        starts.append(length - tile_size)
+        return starts
+
+    tiles = []
+    for y in _starts(height):
+        for x in _starts(width):
+            tiles.append((x, y, min(tile_size, width - x), min(tile_size, height - y)))
+    return tiles
+
+def offset_results(results: List[Dict[str, Any]], x: int, y: int) -> List[Dict[str, Any]]:
+    """将图块内的文字框坐标平移到原图坐标系"""
+    shifted = []
+    for result in results:
+        item = dict(result)
+        item['bbox'] = [[float(px) + x, float(py) + y] for px, py in result['bbox']]
+        shifted.append(item)
+    return shifted
+
+def _bbox_rect(bbox: List[List[float]]) -> Tuple[float, float, float, float]:
+    points = np.array(bbox, dtype=np.float32)
+    return (float(points[:, 0].min()), float(points[:, 1].min()),
+            float(points[:, 0].max()), float(points[:, 1].max()))
+
+def _same_line(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float],
+               min_ratio: float = 0.6) -> bool:
+    """两个框在竖直方向基本重合（同一文字行）"""
+    height_a, height_b = a[3] - a[1], b[3] - b[1]
+    if height_a <= 0 or height_b <= 0:
+        return False
+    inter_h = min(a[3], b[3]) - max(a[1], b[1])
+    return inter_h / min(height_a, height_b) >= min_ratio and \
+        min(height_a, height_b) / max(height_a, height_b) >= min_ratio
+
+def _join_fragment_text(left: str, left_rect: Tuple[float, float, float, float],
+                        right: str, right_rect: Tuple[float, float, float, float]) -> str:
+    """
+    拼接同一文字行左右两段的文字
+
+    两段在重叠区域识别出的文字相同（至少两个字符）时按最长的首尾重合部分拼接；
+    否则以重叠区域中线为界，按字符宽度估算各取一部分
+    """
+    for k in range(min(len(left), len(right)), 1, -1):
+        if left.endswith(right[:k]):
+            return left + right[k:]
+    cut = (max(left_rect[0], right_rect[0]) + min(left_rect[2], right_rect[2])) / 2
+    left_width = max(1e-6, left_rect[2] - left_rect[0])
+    right_width = max(1e-6, right_rect[2] - right_rect[0])
+    left_end = round((cut - left_rect[0]) / left_width * len(left))
+    right_start = round((cut - right_rect[0]) / right_width * len(right))
+    return left[:max(0, left_end)] + right[max(0, right_start):]
+
+def _merge_fragments(a: Dict[str, Any], a_rect: Tuple[float, float, float, float],
+                     b: Dict[str, Any], b_rect: Tuple[float, float, float, float]) -> Dict[str, Any]:
+    """合并同一文字行被图块边界截断的两段：文字框取并集，文字按左右顺序拼接"""
+    if (b_rect[0], b_rect[2]) < (a_rect[0], a_rect[2]):
+        a, a_rect, b, b_rect = b, b_rect, a, a_rect
+    x1, y1 = min(a_rect[0], b_rect[0]), min(a_rect[1], b_rect[1])
+    x2, y2 = max(a_rect[2], b_rect[2]), max(a_rect[3], b_rect[3])
+    merged = dict(a)
+    merged['bbox'] = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+    merged['confidence'] = min(a['confidence'], b['confidence'])
+    if 'text' in a and 'text' in b:
+        merged['text'] = _join_fragment_text(a['text'], a_rect, b['text'], b_rect)
+    return merged
+
+def merge_tile_results(results: List[Dict[str, Any]], overlap_threshold: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    合并图块重叠区域中的重复文字框和被图块边界截断的文字行
+
+    先做NMS式去重：交集占较小框面积的比例达到阈值时视为重复，保留面积更大（更完整）的框，
+    面积相同时保留置信度更高的框。比重叠区域更长的文字行在相邻图块中各被识别出一段，
+    这些同一行上水平方向相交的片段合并为一个框，文字按左右顺序拼接
+
+    Args:
+        results: 已平移到原图坐标系的全部结果
+        overlap_threshold: 判定为重复的交集比例阈值
+
+    Returns:
+        合并后按阅读顺序排列的结果
+    """
+    candidates = []
+    for result in results:
+        rect = _bbox_rect(result['bbox'])
+        area = max(0.0, rect[2] - rect[0]) * max(0.0, rect[3] - rect[1])
+        candidates.append((area, result['confidence'], rect, result))
+    candidates.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+    kept = []
+    for area, _, rect, result in candidates:
+        duplicate = False
+        for kept_area, kept_rect, _ in kept:
+            inter_w = min(rect[2], kept_rect[2]) - max(rect[0], kept_rect[0])
+            inter_h = min(rect[3], kept_rect[3]) - max(rect[1], kept_rect[1])
+            if inter_w <= 0 or inter_h <= 0:
+                continue
+            smaller = min(area, kept_area)
+            if smaller > 0 and inter_w * inter_h / smaller >= overlap_threshold:
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append((area, rect, result))
+
+    # 同一行上水平相交的片段两两合并，直到没有可合并的片段
+    kept = [(rect, result) for _, rect, result in kept]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(kept)):
+            for j in range(i + 1, len(kept)):
+                (rect_a, result_a), (rect_b, result_b) = kept[i], kept[j]
+                if min(rect_a[2], rect_b[2]) - max(rect_a[0], rect_b[0]) <= 0 or not _same_line(rect_a, rect_b):
+                    continue
+                result = _merge_fragments(result_a, rect_a, result_b, rect_b)
+                kept[i] = (_bbox_rect(result['bbox']), result)
+                del kept[j]
+                merged = True
+                break
+            if merged:
+                break
+
+    kept.sort(key=lambda item: (item[0][1], item[0][0]))
+    return [item[1] for item in kept]
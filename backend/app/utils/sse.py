@@ -0,0 +1,18 @@
+"""
+Server-Sent Events工具
+"""
+import json
+from typing import Any
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    格式化一条SSE消息
+
+    Args:
+        event: 事件名
+        data: 可JSON序列化的数据
+
+    Returns:
+        以空行结尾的SSE消息文本
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
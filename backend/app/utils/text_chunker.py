@@ -0,0 +1,101 @@
+"""
+长文本分段工具
+按句子和标点边界将长文本切分为不超过预算的片段，翻译后按原顺序拼接
+"""
+import re
+from typing import Callable, List
+
+# 句末标点（含中日韩全角标点）、换行及其后的引号、括号和空白
+_SENTENCE_END = re.compile(r'(?:[。！？!?；;…]+|\.(?=\s|$)|\n)["\'”’」』）)\]]*\s*')
+
+# 句内的次级断点：逗号、顿号、冒号和空白
+_CLAUSE_END = re.compile(r'[，,、：:]\s*|\s+')
+
+_CJK_PATTERN = re.compile(r'[　-ヿ㐀-䶿一-鿿가-힯＀-￯]')
+
+def _split_after(text: str, pattern: re.Pattern) -> List[str]:
+    """在每个匹配位置之后切分，片段首尾相接即为原文"""
+    pieces: List[str] = []
+    start = 0
+    for match in pattern.finditer(text):
+        if match.end() > start:
+            pieces.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+def _hard_split(text: str, max_size: float, size: Callable[[str], float]) -> List[str]:
+    """没有可用断点时按字符切分"""
+    pieces: List[str] = []
+    start = 0
+    for end in range(1, len(text) + 1):
+        if end - start > 1 and size(text[start:end]) > max_size:
+            pieces.append(text[start:end - 1])
+            start = end - 1
+    pieces.append(text[start:])
+    return pieces
+
+def split_text(text: str, max_size: float, size: Callable[[str], float]) -> List[str]:
+    """
+    将文本切分为大小不超过max_size的片段
+
+    优先在句末标点和换行处切分，单句超出预算时在逗号、空白等处切分，
+    仍然超出时按字符切分；相邻片段在预算内尽量合并。片段首尾相接即为原文
+
+    Args:
+        text: 文本
+        max_size: 每个片段的大小上限
+        size: 计算片段大小的函数
+
+    Returns:
+        片段列表（文本未超出预算时只有一个片段）
+    """
+    if size(text) <= max_size:
+        return [text]
+
+    units: List[str] = []
+    for sentence in _split_after(text, _SENTENCE_END):
+        if size(sentence) <= max_size:
+            units.append(sentence)
+            continue
+        for clause in _split_after(sentence, _CLAUSE_END):
+            if size(clause) <= max_size:
+                units.append(clause)
+            else:
+                units.extend(_hard_split(clause, max_size, size))
+
+    chunks: List[str] = []
+    current = ""
+    for unit in units:
+        if current and size(current + unit) > max_size:
+            chunks.append(current)
+            current = ""
+        current += unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+def join_chunks(chunks: List[str], translations: List[str]) -> str:
+    """
+    按原顺序拼接各片段的译文
+
+    保留原片段末尾的换行；其余片段之间，译文两侧都不是中日韩文字时以空格分隔，否则直接相连
+
+    Args:
+        chunks: split_text返回的原文片段
+        translations: 与chunks对应的译文
+    """
+    result = ""
+    for index, (chunk, translated) in enumerate(zip(chunks, translations)):
+        translated = translated.strip()
+        if index == len(chunks) - 1:
+            result += translated
+            break
+        separator = chunk[len(chunk.rstrip()):]
+        next_text = translations[index + 1].strip()
+        if translated and next_text and "\n" not in separator:
+            cjk = bool(_CJK_PATTERN.match(translated[-1])) or bool(_CJK_PATTERN.match(next_text[0]))
+            separator = "" if cjk else " "
+        result += translated + separator
+    return result
@@ -0,0 +1,22 @@
+"""
+文本token数估算工具
+不依赖具体分词器，按字符类别粗略估算，用于请求打包和分段的预算控制
+"""
+import math
+import re
+
+# 中日韩文字和全角符号大致每个字符一个token，其余文字约四个字符一个token
+_CJK_PATTERN = re.compile(r'[　-ヿ㐀-䶿一-鿿가-힯豈-﫿＀-￯]')
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的token数
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的token数（至少为1）
+    """
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    return max(1, cjk_count + math.ceil((len(text) - cjk_count) / 4))
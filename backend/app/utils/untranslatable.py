@@ -0,0 +1,39 @@
+"""
+无需翻译的文字识别
+纯数字、价格、网址、邮箱、日期时间、标点符号等文字翻译前后相同，直接原样保留
+"""
+import re
+
+# 任意字母（含中日韩文字），不含字母的文字（数字、标点、货币符号等）无需翻译
+_LETTER_PATTERN = re.compile(r'[^\W\d_]')
+
+_NUMBER = r'[+\-±]?\d[\d,，]*(?:[.．]\d+)?%?'
+_CURRENCY_CODE = r'(?:USD|EUR|JPY|CNY|RMB|GBP|KRW|HKD|TWD|AUD|CAD)'
+_TIME = r'\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp]\.?[Mm]\.?)?'
+_DATE = r'\d{4}[-/.]\d{1,2}[-/.]\d{1,2}'
+
+# 含字母但仍无需翻译的格式，整段匹配
+_UNTRANSLATABLE_PATTERN = re.compile(
+    r'(?:https?://|www\.)\S+'                                   # 网址
+    r'|[\w.+\-]+@[\w\-]+(?:\.[\w\-]+)+'                         # 邮箱
+    rf'|{_CURRENCY_CODE}\s?{_NUMBER}|{_NUMBER}\s?{_CURRENCY_CODE}'  # 带货币代码的价格
+    rf'|{_DATE}(?:[T ]{_TIME}(?:Z|[+\-]\d{{2}}:?\d{{2}})?)?'       # 日期、ISO时间戳
+    rf'|{_TIME}',                                               # 带AM/PM的时间
+    re.IGNORECASE
+)
+
+def is_untranslatable(text: str) -> bool:
+    """
+    判断文字是否无需翻译
+
+    Args:
+        text: OCR识别出的文字
+
+    Returns:
+        空白、不含字母的文字（数字、价格、时间、标点等），或整段为网址、邮箱、
+        带货币代码的价格、时间戳时返回True
+    """
+    text = text.strip()
+    if not _LETTER_PATTERN.search(text):
+        return True
+    return _UNTRANSLATABLE_PATTERN.fullmatch(text) is not None
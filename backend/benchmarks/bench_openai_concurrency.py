@@ -0,0 +1,103 @@
+"""
+OpenAI翻译并发基准测试
+启动本地的OpenAI兼容模拟服务，对比并发上限为1与配置值时批量翻译的耗时
+
+用法（在backend目录下）：
+    python -m benchmarks.bench_openai_concurrency [--texts N] [--latency 毫秒] [--concurrency N]
+
+模拟服务每个请求固定延迟返回，并记录同时处理的最大请求数，用于确认请求确实并行发出
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+from app.core.config_manager import config_manager
+from app.services.translation_memory import translation_memory
+from app.services.translation_service import translation_service, TranslationProvider
+
+class MockOpenAIServer:
+    """最小的/v1/chat/completions模拟实现"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.active = 0
+        self.peak_active = 0
+        self.requests = 0
+
+    async def chat_completions(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        text = body["messages"][-1]["content"].rsplit("\n\n", 1)[-1]
+        return web.json_response({
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"[translated] {text}"},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        })
+
+    def reset(self):
+        self.peak_active = 0
+        self.requests = 0
+
+async def run_benchmark(texts: int, latency: float, concurrency: int):
+    server = MockOpenAIServer(latency)
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", server.chat_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    # 只修改内存中的配置，不写回配置文件
+    config = config_manager.get_translation_config(TranslationProvider.OPENAI.value)
+    config.packed = False
+    # 只比较并发上限，关闭每分钟请求数和token数限制以及对冲
+    config.requests_per_minute = 0
+    config.tokens_per_minute = 0
+    config.hedge_percentile = 0
+    translation_memory.enabled = False
+    translation_service.openai_api_key = "mock"
+    translation_service.openai_base_url = f"http://127.0.0.1:{port}/v1"
+
+    try:
+        for limit in (1, concurrency):
+            config.max_concurrency = limit
+            # 每轮使用新的限流器，上一轮的自适应并发和令牌桶状态不带入本轮
+            translation_service._limiters.pop(TranslationProvider.OPENAI.value, None)
+            server.reset()
+            batch = [f"第{limit}轮 文字{i}" for i in range(texts)]
+            start = time.perf_counter()
+            results = await translation_service.batch_translate(batch, "en", "zh", TranslationProvider.OPENAI)
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for original, result in zip(batch, results) if original == result)
+            print(f"并发上限 {limit:>3}: 耗时 {elapsed:.2f}s，{server.requests} 个请求，"
+                  f"服务端最大并发 {server.peak_active}，失败 {failed}")
+    finally:
+        await translation_service.close()
+        await runner.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI翻译并发基准测试")
+    parser.add_argument("--texts", type=int, default=40, help="批量翻译的文字数")
+    parser.add_argument("--latency", type=float, default=200, help="模拟服务每个请求的延迟（毫秒）")
+    parser.add_argument("--concurrency", type=int, default=8, help="对比的并发上限")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.texts, args.latency / 1000, args.concurrency))
+
+if __name__ == "__main__":
+    main()
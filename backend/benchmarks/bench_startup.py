@@ -0,0 +1,87 @@
+"""
+启动耗时预算检查
+在全新的解释器中测量 `import main` 的耗时，超过预算时以非零状态退出，可直接用于CI
+
+用法（在backend目录下）：
+    python -m benchmarks.bench_startup [--budget 秒] [--repeat N] [--with-ocr]
+
+--with-ocr 额外测量OCR进程池的冷启动（模型加载 + 预热）耗时
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import main; "
+    "print(time.perf_counter() - start)"
+)
+
+# 这些模块只应在OCR工作进程内或首次使用时加载
+HEAVY_MODULES = ("paddleocr", "paddle", "openai", "matplotlib", "skimage")
+
+HEAVY_SNIPPET = (
+    "import sys, main; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+def measure_import(repeat: int) -> list:
+    """每次在新进程中导入main，返回各次耗时（秒）"""
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+def find_heavy_imports() -> list:
+    """返回导入main时被加载的重量级模块"""
+    output = subprocess.run(
+        [sys.executable, "-c", HEAVY_SNIPPET],
+        capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()
+    return [name for name in (output[-1] if output else "").split(",") if name]
+
+def measure_ocr_cold_start() -> float:
+    """测量OCR进程池从创建到全部工作进程预热完成的耗时"""
+    from app.services.ocr_worker_pool import ocr_worker_pool
+
+    async def _start():
+        start = time.perf_counter()
+        await ocr_worker_pool.start()
+        return time.perf_counter() - start
+
+    try:
+        return asyncio.run(_start())
+    finally:
+        ocr_worker_pool.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时预算检查")
+    parser.add_argument("--budget", type=float, default=1.5, help="import main 的耗时上限（秒）")
+    parser.add_argument("--repeat", type=int, default=5, help="测量次数")
+    parser.add_argument("--with-ocr", action="store_true", help="同时测量OCR冷启动耗时")
+    args = parser.parse_args()
+
+    timings = measure_import(args.repeat)
+    median = statistics.median(timings)
+    heavy = find_heavy_imports()
+
+    print(f"import main: 中位 {median:.3f}s，最大 {max(timings):.3f}s（预算 {args.budget:.3f}s）")
+    if heavy:
+        print(f"导入main时加载了重量级模块: {', '.join(heavy)}")
+
+    if args.with_ocr:
+        print(f"OCR冷启动（模型加载 + 预热）: {measure_ocr_cold_start():.2f}s")
+
+    if median > args.budget or heavy:
+        print("启动耗时检查未通过")
+        sys.exit(1)
+    print("启动耗时检查通过")
+
+if __name__ == "__main__":
+    main()
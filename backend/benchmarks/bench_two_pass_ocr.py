@@ -0,0 +1,72 @@
+"""
+两级分辨率OCR基准测试
+对比单次完整识别与“缩小图检测 + 原图裁剪识别”的耗时
+
+用法（在backend目录下）：
+    python -m benchmarks.bench_two_pass_ocr [图片路径] [--repeat N]
+
+未指定图片时生成一张 4000x3000 的合成文字图片
+"""
+import argparse
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from app.services.ocr_service import OCRService
+
+def build_synthetic_image(width: int = 4000, height: int = 3000) -> np.ndarray:
+    """生成带多行英文文字的高像素测试图片"""
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    rng = np.random.default_rng(0)
+    y = 120
+    while y < height - 60:
+        x = int(rng.integers(40, 400))
+        font_scale = float(rng.uniform(1.2, 3.0))
+        text = f"Sample line {y} price {int(rng.integers(1, 999))}.99 OK Cancel"
+        cv2.putText(image, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), 3)
+        y += int(60 * font_scale)
+    return image
+
+def measure(func, image: np.ndarray, repeat: int):
+    """返回各次耗时（秒）和最后一次的结果"""
+    timings = []
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = func(image)
+        timings.append(time.perf_counter() - start)
+    return timings, results
+
+def main():
+    parser = argparse.ArgumentParser(description="两级分辨率OCR基准测试")
+    parser.add_argument("image", nargs="?", help="测试图片路径")
+    parser.add_argument("--repeat", type=int, default=5, help="每种模式的重复次数")
+    args = parser.parse_args()
+
+    if args.image:
+        image = cv2.imread(args.image)
+        if image is None:
+            raise SystemExit(f"无法读取图片: {args.image}")
+    else:
+        image = build_synthetic_image()
+
+    service = OCRService()
+    engine = service.ocr
+    # 预热，避免首次推理的初始化开销计入结果
+    service._run_full_ocr(image, engine)
+
+    single_timings, single_results = measure(lambda img: service._run_full_ocr(img, engine), image, args.repeat)
+    two_pass_timings, two_pass_results = measure(lambda img: service._run_two_pass(img, engine), image, args.repeat)
+
+    single_median = statistics.median(single_timings)
+    two_pass_median = statistics.median(two_pass_timings)
+
+    print(f"图片尺寸: {image.shape[1]}x{image.shape[0]}，重复 {args.repeat} 次")
+    print(f"单次完整识别:   中位耗时 {single_median * 1000:.1f} ms，{len(single_results)} 个文字区域")
+    print(f"两级分辨率识别: 中位耗时 {two_pass_median * 1000:.1f} ms，{len(two_pass_results)} 个文字区域")
+    print(f"加速比: {single_median / two_pass_median:.2f}x")
+
+if __name__ == "__main__":
+    main()
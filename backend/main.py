@@ -1,19 +1,53 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+import asyncio
+import logging
 import os
 
 from app.routers import upload, ocr, translate, process, config, history
-from app.database.database import engine
+from app.database.database import engine, add_missing_columns
 from app.database.models import Base
+from app.services.ocr_worker_pool import ocr_worker_pool
+from app.services.http_session_pool import http_session_pool
+from app.services.translation_service import translation_service
 
-# 创建数据库表
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+async def warm_up_services():
+    """后台加载并预热OCR模型，完成后服务进入就绪状态"""
+    try:
+        await ocr_worker_pool.start()
+    except Exception as e:
+        logger.error(f"OCR服务预热失败: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期
+    
+    模型加载放在后台任务中，启动后即可响应/health，/ready在预热完成后返回就绪
+    """
+    # 创建数据库表
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(Base.metadata)
+    
+    await http_session_pool.start()
+    warm_up_task = asyncio.create_task(warm_up_services())
+    yield
+    if not warm_up_task.done():
+        warm_up_task.cancel()
+    ocr_worker_pool.shutdown()
+    await http_session_pool.close()
+    await translation_service.close()
 
 app = FastAPI(
     title="图片文字翻译API",
     description="基于PaddleOCR和AI大模型的智能图片文字翻译工具",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # 配置CORS
@@ -47,7 +81,14 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "ready": ocr_worker_pool.ready}
+
+@app.get("/ready")
+async def readiness_check():
+    """就绪检查：OCR模型预热完成前返回503"""
+    if not ocr_worker_pool.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True, "warmup_seconds": ocr_worker_pool.warmup_seconds}
 
 if __name__ == "__main__":
     import uvicorn